@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import os
+import shutil
+import tempfile
+
+
+def current_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+UMASK = current_umask()  # Read once at import, os.umask can only be read by changing it
+
+
+def write_atomic(path, data):
+    """ Replace path with data so the file is always either the old or the new version
+
+    The data goes to a temp file in the same directory, is fsync'd and then
+    renamed over path with os.replace. A crash at any point leaves the old
+    file or the complete new one, never a truncated mix.
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp files are private: keep the original's mode, or give a new
+        # file the mode open() would have
+        try:
+            shutil.copymode(path, temp_path)
+        except FileNotFoundError:
+            os.chmod(temp_path, 0o666 & ~UMASK)
+        except OSError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    fsync_directory(path.parent)
+
+
+def fsync_directory(directory):
+    # Makes the rename itself durable; directories can't be opened on Windows
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class BackgroundWriter:
+    """ Runs write jobs on a worker thread and reports back on the Tk loop
+
+    Jobs run one at a time in the order they were submitted, so two saves
+    of the same file can't overtake each other. done(result) or
+    failed(exception) is called from an after() callback, never from the
+    worker.
+    """
+
+    def __init__(self, widget, interval=20):
+        self.widget = widget
+        self.interval = interval
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="writer")
+        self.pending = 0
+
+    def busy(self):
+        return self.pending > 0
+
+    def submit(self, job, done=None, failed=None):
+        future = self.executor.submit(job)
+        self.pending += 1
+        self.widget.after(self.interval, self.poll, future, done, failed)
+        return future
+
+    def poll(self, future, done, failed):
+        if not future.done():
+            self.widget.after(self.interval, self.poll, future, done, failed)
+            return
+        self.pending -= 1
+        error = future.exception()
+        if error is not None:
+            if failed is not None:
+                failed(error)
+        elif done is not None:
+            done(future.result())
+
+    def wait(self):
+        """ Block until every submitted job has finished, for shutting down """
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,142 @@
+from datetime import datetime
+from pathlib import Path
+import difflib
+import hashlib
+import json
+import marshal
+import zlib
+
+
+def make_delta(old, new):
+    """ Line-level delta turning old into new
+
+    Saves keep one entry per line, so even multi-kilobyte values diff as a
+    single line and the matcher only ever compares a few hundred lines.
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append((i1, i2))
+        elif j1 < j2:
+            ops.append(b"".join(new_lines[j1:j2]))
+    return ops
+
+
+def apply_delta(old, ops):
+    old_lines = old.splitlines(keepends=True)
+    return b"".join(op if isinstance(op, bytes) else b"".join(old_lines[op[0]:op[1]]) for op in ops)
+
+
+class BackupStore:
+    """ Deduplicated, delta-compressed snapshots of save files
+
+    Each save gets its own directory holding a manifest.json and an
+    objects/ folder. Objects are named after the SHA-256 of the snapshot
+    they rebuild. A snapshot is stored either whole or as a zlib-compressed
+    line delta against the snapshot before it. Identical content is never
+    stored twice, and retention only has to read the manifest.
+    """
+
+    def __init__(self, root=Path("save_backups"), keep=5, full_every=10):
+        self.root = Path(root)
+        self.keep = keep
+        self.full_every = full_every
+
+    def save_dir(self, save_path):
+        save_path = Path(save_path)
+        path_hash = hashlib.sha1(str(save_path.resolve()).encode('utf-8')).hexdigest()[:8]
+        return self.root / f"{save_path.stem}_{path_hash}"
+
+    def history(self, save_path):
+        """ Manifest entries for save_path, oldest first """
+        try:
+            return json.loads((self.save_dir(save_path) / "manifest.json").read_text())
+        except (OSError, ValueError):
+            return []
+
+    def write_manifest(self, save_path, entries):
+        (self.save_dir(save_path) / "manifest.json").write_text(json.dumps(entries, indent=1))
+
+    def latest(self, save_path):
+        entries = self.history(save_path)
+        return entries[-1] if entries else None
+
+    def object_path(self, save_path, entry):
+        return self.save_dir(save_path) / "objects" / entry["object"]
+
+    def read(self, save_path, entry, entries=None):
+        """ Content of the snapshot described by entry """
+        data = zlib.decompress(self.object_path(save_path, entry).read_bytes())
+        if entry.get("base") is None:
+            return data
+        if entries is None:
+            entries = self.history(save_path)
+        base = next(e for e in entries if e["hash"] == entry["base"])
+        return apply_delta(self.read(save_path, base, entries), marshal.loads(data))
+
+    def write_object(self, save_path, name, payload):
+        objects = self.save_dir(save_path) / "objects"
+        objects.mkdir(parents=True, exist_ok=True)
+        (objects / name).write_bytes(zlib.compress(payload, 9))
+
+    def snapshot(self, save_path):
+        """ Record the current content of save_path, None if it's unchanged """
+        content = Path(save_path).read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        entries = self.history(save_path)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        if entries and entries[-1]["hash"] == digest:
+            return None
+        known = next((e for e in entries if e["hash"] == digest), None)
+        if known is not None:
+            # Back to an earlier state, reuse its object
+            entry = dict(known, time=timestamp)
+        elif entries and entries[-1].get("depth", 0) + 1 < self.full_every:
+            previous = entries[-1]
+            delta = make_delta(self.read(save_path, previous, entries), content)
+            entry = {"hash": digest, "time": timestamp, "object": f"{digest}.delta",
+                     "base": previous["hash"], "depth": previous.get("depth", 0) + 1}
+            self.write_object(save_path, entry["object"], marshal.dumps(delta))
+        else:
+            entry = {"hash": digest, "time": timestamp, "object": f"{digest}.full", "base": None, "depth": 0}
+            self.write_object(save_path, entry["object"], content)
+
+        entries.append(entry)
+        self.prune(save_path, entries)
+        return entry
+
+    def prune(self, save_path, entries):
+        stored = {e["object"] for e in entries}
+        kept = entries[-self.keep:]
+        kept_hashes = {e["hash"] for e in kept}
+        # Deltas whose base is about to go away become full snapshots first
+        for entry in kept:
+            if entry.get("base") is not None and entry["base"] not in kept_hashes:
+                content = self.read(save_path, entry, entries)
+                entry.update(object=f"{entry['hash']}.full", base=None, depth=0)
+                self.write_object(save_path, entry["object"], content)
+                for other in kept:
+                    if other["hash"] == entry["hash"]:
+                        other.update(object=entry["object"], base=None, depth=0)
+
+        self.write_manifest(save_path, kept)
+        for name in stored - {e["object"] for e in kept}:
+            try:
+                (self.save_dir(save_path) / "objects" / name).unlink()
+            except OSError:
+                pass
+
+    def restore(self, save_path, entry=None):
+        """ Write a snapshot (the latest by default) back over save_path """
+        entries = self.history(save_path)
+        if entry is None:
+            if not entries:
+                return None
+            entry = entries[-1]
+        from atomic_write import write_atomic
+        write_atomic(save_path, self.read(save_path, entry, entries))
+        return entry
@@ -0,0 +1,154 @@
+""" Apply one patch file to many saves without the GUI
+
+    python batch_patch.py patch.json saves/*/MainActivity.xml
+
+The patch file is JSON, every section is optional:
+
+    {
+        "values": {"dynamons_worldPLAYER_COINS": "999999"},
+        "items": {"heal_spray": 9999, "discatch_special": 1},
+        "mons": [
+            {"where": {"names": ["anubolt"], "max_level": 50},
+             "set": {"level": 75, "health": 100}}
+        ]
+    }
+
+"where" takes the same conditions as Roster.select, leave it out to touch
+every Dynamon. "values" are strings or numbers; true and false are written
+the way the game spells them.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import glob
+import json
+import sys
+import time
+from save_document import SaveDocument
+from save_codecs import SaveFields
+from roster import FIELDS
+
+MONS_KEY = "dynamons_worldMONS_DATA"
+ITEMS_KEY = "dynamons_worldITEMS_DATA"
+WHERE_CONDITIONS = ("names", "min_level", "max_level")  # Roster.select's parameters that JSON can express
+
+
+def value_text(value):
+    """ Save spelling of a JSON patch value, booleans are lowercase like the game writes them """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def load_patch(path):
+    with open(path, encoding='utf-8') as f:
+        patch = json.load(f)
+    unknown = set(patch) - {"values", "items", "mons"}
+    if unknown:
+        raise ValueError(f"Unknown patch sections: {', '.join(sorted(unknown))}")
+    bad_values = [key for key, value in patch.get("values", {}).items() if not isinstance(value, (str, int, float))]
+    if bad_values:
+        raise ValueError(f"Values must be strings, numbers or booleans: {', '.join(sorted(bad_values))}")
+    for rule in patch.get("mons", ()):
+        bad_conditions = set(rule.get("where", {})) - set(WHERE_CONDITIONS)
+        if bad_conditions:
+            raise ValueError(f"Unknown \"where\" conditions: {', '.join(sorted(bad_conditions))}"
+                             f" (use {', '.join(WHERE_CONDITIONS)})")
+        bad_fields = set(rule.get("set", {})) - set(FIELDS)
+        if bad_fields:
+            raise ValueError(f"Unknown Dynamon fields: {', '.join(sorted(bad_fields))}")
+    return patch
+
+
+def apply_patch(document, patch):
+    """ Apply patch to a SaveDocument, returns the names of the changed entries """
+    for key, value in patch.get("values", {}).items():
+        document.set(key, value_text(value))
+
+    fields = SaveFields(document)
+    if patch.get("items") and ITEMS_KEY in fields:
+        fields[ITEMS_KEY].update(patch["items"])
+        fields.mark_modified(ITEMS_KEY)
+
+    if patch.get("mons") and MONS_KEY in fields:
+        roster = fields[MONS_KEY]
+        for rule in patch["mons"]:
+            indices = roster.select(**rule.get("where", {}))
+            for field, value in rule.get("set", {}).items():
+                roster.set_column(field, value, indices)
+        fields.mark_modified(MONS_KEY)
+    fields.flush()
+    return sorted(document.dirty)
+
+
+def patch_file(path, patch, dry_run=False, backup_dir=None):
+    """ Worker: patch one save, returns a result dict instead of raising """
+    start = time.perf_counter()
+    try:
+        document = SaveDocument.load(path)
+        changed = apply_patch(document, patch)
+        if changed and not dry_run:
+            if backup_dir is not None:
+                from backups import BackupStore
+                BackupStore(backup_dir).snapshot(path)
+            document.write(path)
+        return {"path": str(path), "ok": True, "changed": changed,
+                "seconds": time.perf_counter() - start}
+    except Exception as e:
+        return {"path": str(path), "ok": False, "error": f"{type(e).__name__}: {e}",
+                "seconds": time.perf_counter() - start}
+
+
+def expand_paths(patterns):
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                paths.append(match)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply a patch file to many Dynamons World saves")
+    parser.add_argument("patch", help="JSON patch file")
+    parser.add_argument("saves", nargs="+", help="save files or glob patterns (quote ** patterns)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="report changes without writing")
+    parser.add_argument("--backup-dir", type=Path, default=None, help="snapshot each save here before writing")
+    parser.add_argument("--json", action="store_true", help="print one JSON result per line")
+    args = parser.parse_args(argv)
+
+    try:
+        patch = load_patch(args.patch)
+    except (OSError, ValueError) as e:
+        parser.error(f"Bad patch file: {e}")
+    paths = expand_paths(args.saves)
+    if not paths:
+        parser.error("No save files matched")
+
+    start = time.perf_counter()
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = pool.map(patch_file, paths, [patch] * len(paths), [args.dry_run] * len(paths),
+                           [args.backup_dir] * len(paths), chunksize=max(1, len(paths) // 64))
+        for result in results:
+            if not result["ok"]:
+                failures += 1
+            if args.json:
+                print(json.dumps(result))
+            elif result["ok"]:
+                print(f"ok    {result['seconds'] * 1000:8.1f} ms  {result['path']} ({len(result['changed'])} changed)")
+            else:
+                print(f"FAIL  {result['seconds'] * 1000:8.1f} ms  {result['path']}: {result['error']}")
+
+    if not args.json:
+        elapsed = time.perf_counter() - start
+        print(f"{len(paths) - failures} patched, {failures} failed in {elapsed:.2f} s", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
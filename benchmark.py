@@ -0,0 +1,203 @@
+""" Times the editor's hot paths on synthetic saves, no Tk needed
+
+    python benchmark.py --output results.json
+    python benchmark.py --compare results.json
+
+Saves are generated from temp_save.xml (or a minimal skeleton) with
+MONS_DATA rosters of 10 to 10,000 Dynamons and a PVP_SEASONS blob of a
+matching number of seasons. Results are JSON, one record per case and size.
+"""
+from pathlib import Path
+from xml.sax.saxutils import escape
+import argparse
+import base64
+import json
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+from save_document import SaveDocument
+from roster import Roster
+import lazy_json
+
+SIZES = (10, 100, 1000, 10000)
+TEMPLATE = Path(__file__).with_name("temp_save.xml")
+GAMEPLAY = Path(__file__).with_name("gameplay.dat")
+SKELETON = """<?xml version='1.0' encoding='utf-8'?>
+<map>
+    <string name="dynamons_worldPLAYER_COINS">9185</string>
+    <string name="dynamons_worldMONS_DATA"></string>
+    <string name="dynamons_worldPVP_SEASONS">{}</string>
+</map>
+"""
+SPECIES = ("anubolt", "kikflick", "ursanoid", "mandragor", "zenoflame", "crystaloid", "sharkon", "lumiwing")
+
+
+def mons_string(count, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        species = rng.choice(SPECIES)
+        skin = f"{species}_halloween" if rng.random() < 0.05 else ""
+        records.append(f"{species},{rng.randint(1, 75)},{rng.randint(0, 100)},-1,-1,{rng.randint(0, 9)},-1,0,{skin}")
+    return ";".join(records) + ";"
+
+
+def pvp_seasons_string(count):
+    seasons = {}
+    for i in range(count):
+        season_id = 1000 + i
+        seasons[str(season_id)] = {
+            "id": season_id, "rewarded": bool(i % 2), "startTime": 1753819200000 + i * 86400000,
+            "duration": 86400000,
+            "scoreData": {"score": i, "userId": "ed13f21b9cd222e2", "userName": "player756", "userIcon": "zak",
+                          "leagueXp": i * 10, "position": i % 50, "createTime": 1753883343986,
+                          "mons": [], "dexAmount": 341},
+        }
+    return json.dumps({"currentSeasonId": 1000 + count, "seasons": {"h": seasons}}, separators=(",", ":"))
+
+
+def set_entry(xml, name, value):
+    """ Replace (or fill a self-closing) <string name=...> entry in the template """
+    pattern = re.compile(rf'<string name="{re.escape(name)}"\s*(?:/>|>.*?</string>)', re.S)
+    replacement = f'<string name="{name}">{escape(value)}</string>'
+    if pattern.search(xml):
+        return pattern.sub(lambda m: replacement, xml, count=1)
+    return xml.replace("</map>", f"    {replacement}\n</map>")
+
+
+def synthetic_save(size):
+    xml = TEMPLATE.read_text(encoding='utf-8') if TEMPLATE.exists() else SKELETON
+    xml = set_entry(xml, "dynamons_worldMONS_DATA", mons_string(size))
+    xml = set_entry(xml, "dynamons_worldPVP_SEASONS", pvp_seasons_string(size))
+    return xml.encode('utf-8')
+
+
+def measure(func, repeat, number=None):
+    """ Seconds per call: min and median over repeat runs """
+    if number is None:
+        # Aim for runs of at least ~20 ms so timer resolution doesn't matter
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            if time.perf_counter() - start >= 0.02 or number >= 10000:
+                break
+            number *= 2
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        runs.append((time.perf_counter() - start) / number)
+    return {"min": min(runs), "median": statistics.median(runs), "number": number, "repeat": repeat}
+
+
+def save_cases(size):
+    data = synthetic_save(size)
+    mons = SaveDocument.from_bytes(data).get("dynamons_worldMONS_DATA")
+    roster = Roster.parse(mons)
+
+    def save():
+        document = SaveDocument.from_bytes(data)
+        document.set("dynamons_worldPLAYER_COINS", "999999")
+        document.set("dynamons_worldMONS_DATA", roster.serialize())
+        document.patched_bytes()
+
+    return {
+        "save_load": lambda: SaveDocument.from_bytes(data),
+        "save_write": save,
+        "roster_parse": lambda: Roster.parse(mons),
+        "roster_serialize": roster.serialize,
+    }, len(data)
+
+
+def gameplay_cases(path):
+    encoded = path.read_bytes()
+    lazy = lazy_json.load_file(path)
+    return {
+        "gameplay_eager_load": lambda: json.loads(base64.b64decode(encoded)),
+        "gameplay_lazy_load": lambda: lazy_json.load_file(path),
+        "gameplay_dumps": lambda: lazy_json.dumps(lazy),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(sizes, repeat, gameplay=GAMEPLAY, only=None):
+    results = []
+
+    def record(case, func, size=None, input_bytes=None):
+        if only and not any(pattern in case for pattern in only):
+            return
+        timing = measure(func, repeat)
+        results.append(dict(case=case, size=size, bytes=input_bytes, **timing))
+        label = case if size is None else f"{case}[{size}]"
+        print(f"{label:32} {timing['min'] * 1000:10.3f} ms", file=sys.stderr)
+
+    for size in sizes:
+        cases, input_bytes = save_cases(size)
+        for case, func in cases.items():
+            record(case, func, size, input_bytes)
+    if gameplay is not None and Path(gameplay).exists():
+        for case, func in gameplay_cases(Path(gameplay)).items():
+            record(case, func, input_bytes=Path(gameplay).stat().st_size)
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "revision": git_revision(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """ Cases that got slower than baseline by more than threshold, as (key, old, new) """
+    old = {(r["case"], r["size"]): r["min"] for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        key = (result["case"], result["size"])
+        if key in old and result["min"] > old[key] * (1 + threshold):
+            regressions.append((key, old[key], result["min"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark save parsing, rosters and gameplay.dat loading")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="roster sizes to generate")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--gameplay", type=Path, default=GAMEPLAY, help="gameplay.dat to load")
+    parser.add_argument("--only", nargs="+", help="run only cases whose name contains one of these")
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="baseline report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown vs the baseline")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.repeat, args.gameplay, args.only)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    else:
+        print(text)
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.threshold)
+        for (case, size), old, new in regressions:
+            print(f"REGRESSION {case}[{size}]: {old * 1000:.3f} ms -> {new * 1000:.3f} ms", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+from pathlib import Path
+import hashlib
+import marshal
+
+
+def file_digest(path):
+    """ SHA-256 of a file's content, read in 1 MB chunks """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_fields(path, version):
+    """ Fields written by write_fields(), ValueError if they're from another version """
+    with open(path, 'rb') as f:
+        stored, *fields = marshal.load(f)
+    if stored != version:
+        raise ValueError(f"{path} is a version {stored} cache, expected {version}")
+    return fields
+
+
+def write_fields(path, version, fields):
+    with open(path, 'wb') as f:
+        marshal.dump((version, *fields), f)
+
+
+def cached_build(source, kind, version, build, cache_dir=Path("cache"), suffix=".bin"):
+    """ build(source) cached in cache_dir/<kind>_<sha256 of source><suffix>
+
+    build returns a sequence of marshal-able fields. A cache written by
+    another version, or that can't be read, is rebuilt and overwritten.
+    """
+    cache_file = Path(cache_dir) / f"{kind}_{file_digest(source)}{suffix}"
+    try:
+        return read_fields(cache_file, version)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    fields = build(source)
+    try:
+        cache_file.parent.mkdir(exist_ok=True)
+        write_fields(cache_file, version, fields)
+    except OSError:
+        pass  # The cache is only an optimisation
+    return fields
@@ -0,0 +1,126 @@
+from pathlib import Path
+import hashlib
+import json
+import queue
+import threading
+import urllib.error
+import urllib.request
+
+CHUNK_SIZE = 64 * 1024
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+class CachedDownload:
+    """ GET a URL, revalidating a local copy with ETag/Last-Modified """
+
+    def __init__(self, url, cache_dir=Path("cache"), timeout=30):
+        self.url = url
+        self.timeout = timeout
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        self.body_file = Path(cache_dir) / f"download_{name}.body"
+        self.meta_file = Path(cache_dir) / f"download_{name}.json"
+
+    def cached(self):
+        """ (body, metadata) of the cached response, or (None, {}) """
+        try:
+            meta = json.loads(self.meta_file.read_text())
+            return self.body_file.read_bytes(), meta
+        except (OSError, ValueError):
+            return None, {}
+
+    def store(self, body, headers):
+        meta = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+        if not meta["etag"] and not meta["last_modified"]:
+            return  # Nothing to revalidate against next time
+        try:
+            self.body_file.parent.mkdir(exist_ok=True)
+            self.body_file.write_bytes(body)
+            self.meta_file.write_text(json.dumps(meta))
+        except OSError:
+            pass  # The cache is only an optimisation
+
+    def fetch(self, progress=None, cancelled=None):
+        """ Return (body, from_cache)
+
+        progress(received, total) is called after every chunk, total is None
+        without a Content-Length. cancelled is a threading.Event checked
+        between chunks.
+        """
+        if cancelled is not None and cancelled.is_set():
+            raise DownloadCancelled()
+        body, meta = self.cached()
+        request = urllib.request.Request(self.url)
+        if body is not None:
+            if meta.get("etag"):
+                request.add_header("If-None-Match", meta["etag"])
+            if meta.get("last_modified"):
+                request.add_header("If-Modified-Since", meta["last_modified"])
+
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and body is not None:
+                return body, True
+            raise
+
+        with response:
+            total = response.headers.get("Content-Length")
+            total = int(total) if total and total.isdigit() else None
+            chunks = []
+            received = 0
+            while True:
+                if cancelled is not None and cancelled.is_set():
+                    raise DownloadCancelled()
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                received += len(chunk)
+                if progress is not None:
+                    progress(received, total)
+            body = b"".join(chunks)
+            self.store(body, response.headers)
+        return body, False
+
+
+class DownloadTask:
+    """ Runs a CachedDownload on a worker thread
+
+    The thread only posts events to a queue, the Tk side drains them with
+    events() from an after() callback:
+        ("progress", received, total), ("done", body, from_cache),
+        ("error", exception) or ("cancelled",)
+    """
+
+    def __init__(self, url, cache_dir=Path("cache")):
+        self.download = CachedDownload(url, cache_dir)
+        self.queue = queue.Queue()
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        try:
+            body, from_cache = self.download.fetch(
+                lambda received, total: self.queue.put(("progress", received, total)), self.cancelled)
+        except DownloadCancelled:
+            self.queue.put(("cancelled",))
+        except Exception as e:
+            self.queue.put(("error", e))
+        else:
+            self.queue.put(("done", body, from_cache))
+
+    def events(self):
+        while True:
+            try:
+                yield self.queue.get_nowait()
+            except queue.Empty:
+                return
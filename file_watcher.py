@@ -0,0 +1,125 @@
+from pathlib import Path
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from disk_cache import file_digest
+
+# inotify event masks, from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+class FileWatcher:
+    """ Notices when a file's content changes on disk
+
+    On Linux the file's directory is watched with inotify, so a file
+    replaced by adb push (a rename) is caught as well as one written in
+    place. Elsewhere, or if inotify isn't available, the file is polled:
+    mtime and size first, the content hash only when those moved. Either
+    way a change is only reported when the hash differs, so touching the
+    file or writing back the same bytes is ignored.
+
+    The watching thread never calls back into the GUI, pending() is meant
+    to be polled from the Tk loop.
+    """
+
+    def __init__(self, path, interval=1.0):
+        self.path = Path(path).resolve()
+        self.interval = interval
+        self.changed = threading.Event()
+        self.stopped = threading.Event()
+        self.signature = self.stat()
+        self.digest = self.read_digest()
+        self.backend = None
+
+    def stat(self):
+        try:
+            result = os.stat(self.path)
+        except OSError:
+            return None
+        return result.st_mtime_ns, result.st_size
+
+    def read_digest(self):
+        try:
+            return file_digest(self.path)
+        except OSError:
+            return None  # Missing for a moment while it's being replaced
+
+    def start(self):
+        fd = self.open_inotify()
+        if fd is not None:
+            self.backend = "inotify"
+            target, args = self.watch_inotify, (fd,)
+        else:
+            self.backend = "polling"
+            target, args = self.poll, ()
+        threading.Thread(target=target, args=args, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def pending(self):
+        """ True once for every change seen since the last call """
+        if self.changed.is_set():
+            self.changed.clear()
+            return True
+        return False
+
+    def check(self, force=False):
+        signature = self.stat()
+        if signature is None or (signature == self.signature and not force):
+            return
+        self.signature = signature
+        digest = self.read_digest()
+        if digest is not None and digest != self.digest:
+            self.digest = digest
+            self.changed.set()
+
+    def poll(self):
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def open_inotify(self):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(self.path.parent), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def watch_inotify(self, fd):
+        name = os.fsencode(self.path.name)
+        try:
+            while not self.stopped.is_set():
+                # Wake up now and then to notice stop()
+                ready, _, _ = select.select([fd], [], [], self.interval)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                names = set()
+                offset = 0
+                while offset + EVENT.size <= len(data):
+                    _, _, _, length = EVENT.unpack_from(data, offset)
+                    offset += EVENT.size
+                    names.add(data[offset:offset + length].rstrip(b"\0"))
+                    offset += length
+                if name in names:
+                    self.check(force=True)
+        finally:
+            os.close(fd)
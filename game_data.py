@@ -0,0 +1,90 @@
+from pathlib import Path
+import re
+import lazy_json
+from disk_cache import cached_build, read_fields, write_fields
+
+CACHE_VERSION = 3
+
+
+def version_key(version):
+    """ "1.11.63" -> (1, 11, 63), for comparing game versions """
+    return tuple(int(part) for part in re.findall(r"\d+", version or ""))
+
+
+class GameData:
+    """ The parts of gameplay.dat the save editor needs, in a compact form
+
+    Building it means decoding gameplay.dat, so the result is cached with
+    marshal in cache/gamedata_<sha256>.bin and later loads only read that
+    file.
+    """
+
+    def __init__(self, max_level, max_hp, species, min_versions):
+        self.max_level = max_level
+        self.max_hp = max_hp
+        self.species = species  # frozenset of species ids, hidden ones included
+        self.min_versions = min_versions  # [(level, game version needed to reach it), ...]
+
+    @classmethod
+    def build(cls, data):
+        gen = data["monGenData"]
+        species = frozenset(mon["id"] for key in ("mons", "hiddenMons") for mon in data.get(key, ()))
+        min_versions = sorted((entry["level"], entry["version"]) for entry in gen.get("minVersionsByLevel", ()))
+        return cls(gen["maxMonLevel"], data["battleData"]["maxHP"], species, min_versions)
+
+    def fields(self):
+        return self.max_level, self.max_hp, self.species, self.min_versions
+
+    @classmethod
+    def load(cls, path):
+        """ Read a file written by save(), ValueError if it's from another version """
+        return cls(*read_fields(path, CACHE_VERSION))
+
+    def save(self, path):
+        write_fields(path, CACHE_VERSION, self.fields())
+
+    @classmethod
+    def load_or_build(cls, path, cache_dir=Path("cache")):
+        return cls(*cached_build(path, "gamedata", CACHE_VERSION,
+                                 lambda source: cls.build(lazy_json.load_file(source)).fields(), cache_dir))
+
+    def __contains__(self, name):
+        return name in self.species
+
+    def level_cap(self, game_version=None):
+        """ Highest level a save written by game_version may hold """
+        if not game_version:
+            return self.max_level
+        cap = None
+        for level, version in self.min_versions:
+            if version and version_key(version) > version_key(game_version):
+                break
+            cap = level
+        return min(cap or self.max_level, self.max_level)
+
+    def level_caps(self, names, game_version=None):
+        """ Max level per known species among names
+
+        Species newer than game_version aren't left out: names come from a
+        roster that already owns them, which means PREV_GAME_VER lags
+        behind the version that actually wrote the save.
+        """
+        cap = self.level_cap(game_version)
+        return {name: cap for name in set(names) if name in self.species}
+
+    def validate(self, name, level, health):
+        """ field -> problem for the values that don't fit, empty if all is well """
+        problems = {}
+        if name not in self.species:
+            problems["name"] = f"Unknown species '{name}'"
+        try:
+            if not 1 <= int(level) <= self.max_level:
+                problems["level"] = f"Level must be 1-{self.max_level}"
+        except ValueError:
+            problems["level"] = "Level must be a whole number"
+        try:
+            if not 0 <= int(health) <= self.max_hp:
+                problems["health"] = f"Health must be 0-{self.max_hp}"
+        except ValueError:
+            problems["health"] = "Health must be a whole number"
+        return problems
@@ -0,0 +1,63 @@
+from array import array
+from collections import deque, namedtuple
+
+# changes: [(apply, key, old, new)], apply(key, value) puts a value back in place
+Edit = namedtuple("Edit", "label changes")
+
+
+class History:
+    """ Undo and redo stacks of small reversible edits
+
+    An edit only holds the keys it touched with their old and new values,
+    the data being edited is never copied: everything an edit didn't touch
+    stays shared with the live model. Undo and redo just call apply with
+    the old or new values, all in memory.
+    """
+
+    def __init__(self, limit=500):
+        self.undo_stack = deque(maxlen=limit)  # Oldest edits fall off the end
+        self.redo_stack = []
+
+    def __bool__(self):
+        return bool(self.undo_stack or self.redo_stack)
+
+    def record(self, label, changes):
+        changes = tuple(changes)
+        if changes:
+            self.undo_stack.append(Edit(label, changes))
+            self.redo_stack.clear()
+
+    def undo(self):
+        """ Revert the last edit and return it, None if there's nothing to undo """
+        if not self.undo_stack:
+            return None
+        edit = self.undo_stack.pop()
+        for apply, key, old, new in reversed(edit.changes):
+            apply(key, old)
+        self.redo_stack.append(edit)
+        return edit
+
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        edit = self.redo_stack.pop()
+        for apply, key, old, new in edit.changes:
+            apply(key, new)
+        self.undo_stack.append(edit)
+        return edit
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+
+def column_delta(old, new):
+    """ (indices, old values, new values) where two equal-length columns differ
+
+    Numeric columns give arrays, so a bulk edit of thousands of Dynamons
+    is stored in a few compact buffers rather than as a copy of the roster.
+    """
+    indices = array('q', [i for i, (a, b) in enumerate(zip(old, new)) if a != b])
+    if isinstance(old, array):
+        return indices, array(old.typecode, [old[i] for i in indices]), array(new.typecode, [new[i] for i in indices])
+    return indices, [old[i] for i in indices], [new[i] for i in indices]
@@ -0,0 +1,344 @@
+from collections.abc import MutableMapping, MutableSequence
+import binascii
+import json
+import mmap
+import re
+
+# Strings are matched whole so brackets and commas inside them are skipped
+TOKEN_PATTERN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},]')
+KEY_PATTERN = re.compile(rb'\s*("(?:[^"\\]|\\.)*")\s*:\s*')
+WHITESPACE = b" \t\r\n"
+
+
+def decode_base64_file(path, chunk_size=1 << 20):
+    """ base64-decode a file through mmap, one 4-byte aligned chunk at a time
+
+    Only the decoded bytes are kept, there's no full copy of the encoded
+    text and no str copy of the decoded JSON.
+    """
+    decoded = bytearray()
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return decoded
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            carry = b""
+            for offset in range(0, len(data), chunk_size):
+                chunk = carry + data[offset:offset + chunk_size].translate(None, WHITESPACE)
+                usable = len(chunk) - len(chunk) % 4
+                decoded += binascii.a2b_base64(chunk[:usable])
+                carry = chunk[usable:]
+            if carry:
+                raise ValueError("Truncated base64 data")
+    return decoded
+
+
+def strip_span(buffer, start, end):
+    while start < end and buffer[start] in WHITESPACE:
+        start += 1
+    while end > start and buffer[end - 1] in WHITESPACE:
+        end -= 1
+    return start, end
+
+
+def scan_items(buffer, start, end):
+    """ Spans of the direct children of the container at buffer[start:end] """
+    spans = []
+    depth = 0
+    item_start = start + 1
+    for match in TOKEN_PATTERN.finditer(buffer, start, end):
+        char = buffer[match.start()]
+        if char == 0x22:  # "
+            continue
+        if char in b"[{":
+            depth += 1
+        elif char in b"]}":
+            depth -= 1
+            if depth == 0:
+                item = strip_span(buffer, item_start, match.start())
+                if item[0] < item[1]:
+                    spans.append(item)
+                break
+        elif depth == 1:  # , between two children
+            spans.append(strip_span(buffer, item_start, match.start()))
+            item_start = match.end()
+    return spans
+
+
+def load_span(buffer, start, end):
+    """ Scalars are decoded right away, containers stay lazy """
+    first = buffer[start]
+    if first == 0x7b:  # {
+        return LazyObject(buffer, start, end)
+    if first == 0x5b:  # [
+        return LazyArray(buffer, start, end)
+    return json.loads(buffer[start:end])
+
+
+def load_file(path):
+    """ Lazy view of a base64-encoded JSON file like gameplay.dat """
+    buffer = bytes(decode_base64_file(path))
+    start, end = strip_span(buffer, 0, len(buffer))
+    return load_span(buffer, start, end)
+
+
+def is_object(value):
+    return isinstance(value, (dict, LazyObject))
+
+
+def is_array(value):
+    return isinstance(value, (list, LazyArray))
+
+
+def is_container(value):
+    return is_object(value) or is_array(value)
+
+
+def materialize(value):
+    """ json.dumps default= hook, turns lazy containers into plain ones """
+    if isinstance(value, Raw):
+        return json.loads(value.buffer[value.start:value.end])
+    if isinstance(value, LazyObject):
+        return dict(value.items())
+    if isinstance(value, LazyArray):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def children(value, eager_below=0):
+    """ (key, child) pairs of a container, without caching the decoded children on it
+
+    For one-pass walks: a lazy tree walked this way doesn't stay decoded in
+    memory afterwards. Children spanning fewer than eager_below bytes are
+    decoded whole with json.loads, which is quicker than scanning them level
+    by level and still only holds one small subtree at a time.
+    """
+    def load(start, end):
+        if end - start < eager_below:
+            return json.loads(value.buffer[start:end])
+        return load_span(value.buffer, start, end)
+
+    if isinstance(value, LazyObject):
+        for key, span in value.spans.items():
+            yield key, value._values[key] if key in value._values else load(*span)
+    elif isinstance(value, LazyArray):
+        for index, item in enumerate(value.entries):
+            yield index, load(item.start, item.end) if isinstance(item, Span) else item
+    elif isinstance(value, dict):
+        yield from value.items()
+    else:
+        yield from enumerate(value)
+
+
+class LazyObject(MutableMapping):
+    """ JSON object whose members are only decoded when accessed """
+
+    def __init__(self, buffer, start, end):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        self._spans = None
+        self._values = {}
+        self.modified = False
+
+    @property
+    def spans(self):
+        if self._spans is None:
+            self._spans = {}
+            for start, end in scan_items(self.buffer, self.start, self.end):
+                match = KEY_PATTERN.match(self.buffer, start, end)
+                self._spans[json.loads(match.group(1))] = (match.end(), end)
+        return self._spans
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            start, end = self.spans[key]
+            self._values[key] = load_span(self.buffer, start, end)
+        return self._values[key]
+
+    def __setitem__(self, key, value):
+        if key not in self.spans:
+            self.spans[key] = None
+        self._values[key] = value
+        self.modified = True
+
+    def __delitem__(self, key):
+        del self.spans[key]
+        self._values.pop(key, None)
+        self.modified = True
+
+    def __iter__(self):
+        return iter(self.spans)
+
+    def __len__(self):
+        return len(self.spans)
+
+
+class LazyArray(MutableSequence):
+    """ JSON array whose elements are only decoded when accessed """
+
+    def __init__(self, buffer, start, end):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        self._entries = None
+        self.modified = False
+
+    @property
+    def entries(self):
+        # Each entry is a (start, end) span until it has been decoded
+        if self._entries is None:
+            self._entries = [Span(start, end) for start, end in scan_items(self.buffer, self.start, self.end)]
+        return self._entries
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        item = self.entries[index]
+        if isinstance(item, Span):
+            item = self.entries[index] = load_span(self.buffer, item.start, item.end)
+        return item
+
+    def __setitem__(self, index, value):
+        self.entries[index] = value
+        self.modified = True
+
+    def __delitem__(self, index):
+        del self.entries[index]
+        self.modified = True
+
+    def insert(self, index, value):
+        self.entries.insert(index, value)
+        self.modified = True
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class Span:
+    __slots__ = ("start", "end")
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+
+class Raw:
+    """ Encoded JSON still sitting in a source buffer, as kept by snapshot() """
+    __slots__ = ("buffer", "start", "end")
+
+    def __init__(self, buffer, start, end):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+
+
+def snapshot(value):
+    """ Copy of value that later edits can't reach, for encoding on another thread
+
+    Unmodified lazy subtrees become Raw spans of the source buffer, which
+    is never written to, so only the containers on the way to an edit are
+    copied.
+    """
+    if isinstance(value, (LazyObject, LazyArray)) and not is_dirty(value):
+        return Raw(value.buffer, value.start, value.end)
+    if isinstance(value, LazyObject):
+        return {key: snapshot(value._values[key]) if key in value._values else Raw(value.buffer, *span)
+                for key, span in value.spans.items()}
+    if isinstance(value, LazyArray):
+        return [Raw(value.buffer, item.start, item.end) if isinstance(item, Span) else snapshot(item)
+                for item in value.entries]
+    if isinstance(value, dict):
+        return {key: snapshot(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [snapshot(item) for item in value]
+    return value  # Scalars are immutable
+
+
+def is_dirty(value):
+    """ True if value can't be written back as its original bytes """
+    if isinstance(value, LazyObject):
+        return value.modified or any(map(is_dirty, value._values.values()))
+    if isinstance(value, LazyArray):
+        return value.modified or any(is_dirty(item) for item in value._entries or () if not isinstance(item, Span))
+    return is_container(value)
+
+
+def write_compact(value, chunks):
+    if isinstance(value, Raw) or isinstance(value, (LazyObject, LazyArray)) and not is_dirty(value):
+        chunks.append(memoryview(value.buffer)[value.start:value.end])
+    elif isinstance(value, LazyObject):
+        chunks.append(b"{")
+        for i, (key, span) in enumerate(value.spans.items()):
+            if i:
+                chunks.append(b",")
+            chunks.append(json.dumps(key).encode('utf-8') + b":")
+            if key in value._values:
+                write_compact(value._values[key], chunks)
+            else:
+                chunks.append(memoryview(value.buffer)[span[0]:span[1]])
+        chunks.append(b"}")
+    elif isinstance(value, LazyArray):
+        chunks.append(b"[")
+        for i, item in enumerate(value.entries):
+            if i:
+                chunks.append(b",")
+            if isinstance(item, Span):
+                chunks.append(memoryview(value.buffer)[item.start:item.end])
+            else:
+                write_compact(item, chunks)
+        chunks.append(b"]")
+    elif isinstance(value, dict):
+        chunks.append(b"{")
+        for i, (key, item) in enumerate(value.items()):
+            if i:
+                chunks.append(b",")
+            chunks.append(json.dumps(key).encode('utf-8') + b":")
+            write_compact(item, chunks)
+        chunks.append(b"}")
+    elif isinstance(value, list):
+        chunks.append(b"[")
+        for i, item in enumerate(value):
+            if i:
+                chunks.append(b",")
+            write_compact(item, chunks)
+        chunks.append(b"]")
+    else:
+        chunks.append(json.dumps(value).encode('utf-8'))
+
+
+def dumps(value, indent=None):
+    """ Encode to JSON bytes, compact unless indent is given
+
+    Compact output copies every unmodified subtree straight from the
+    source buffer instead of decoding and re-encoding it.
+    """
+    if indent is not None:
+        return json.dumps(value, indent=indent, default=materialize).encode('utf-8')
+    chunks = []
+    write_compact(value, chunks)
+    return b"".join(chunks)
+
+
+def display_value(value):
+    """ How a scalar is shown in the editor, in JSON spelling """
+    if value is None or isinstance(value, bool):
+        return json.dumps(value)
+    return value
+
+
+def parse_like(original, text):
+    """ Parse edited text back into the type of the value it replaces """
+    if isinstance(original, bool):
+        if text.strip().lower() not in ("true", "false"):
+            raise ValueError(f"Expected true or false, got {text!r}")
+        return text.strip().lower() == "true"
+    if isinstance(original, int):
+        return int(text)
+    if isinstance(original, float):
+        return float(text)
+    if original is None:
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+    return text
@@ -1,16 +1,17 @@
-import xml.etree.ElementTree as ET
+import time
+STARTED = time.perf_counter()  # For the time-to-first-window measurement
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
-import shutil
-from datetime import datetime
-from PIL import Image, ImageTk
-import urllib.request
-import io
 import os
 import sys
-import base64
-import json
+import threading
+from roster import Roster
+from history import History, column_delta
+from profiling import profiler
+# PIL, XML parsing, JSON, urllib and friends are imported by the code paths
+# that need them, so a session that only uses the Player tab never loads them
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -30,15 +31,47 @@ class SaveEditor:
         self.root.geometry("800x600")
 
         self.current_file = None
+        self.document = None
+        self.fields = None
         self.backup_dir = Path("save_backups")
         self.backup_dir.mkdir(exist_ok=True)
+        self.backups = None
+        self.writer = None  # Saves run on its worker thread, see background_writer()
+
+        # Undo/redo, one history for the loaded save (Player and Party tabs)
+        # and one for the Whole Thing Editor file
+        self.history = History()
+        self.wte_history = History()
+        self.player_values = {}  # Player tab values as of the last recorded edit
+
+        # Optional watch on the loaded save, for saves pulled again with adb
+        self.watch_var = tk.BooleanVar(value=False)
+        self.watcher = None
         
         # URL for the default save file
         self.default_save_url = "https://kenzieshane.my.id/MainActivity.xml"  # Replace with your actual URL
+        self.download = None
 
         # For Whole Thing Editor part
         self.wte_current_file_path = None
         self.wte_data = {}
+        self.wte_paths = {}  # tree item -> path of keys/indexes into wte_data
+        self.wte_unloaded = set()  # container items whose children aren't inserted yet
+        self.wte_index = None
+        self.wte_matches = []
+        self.wte_query = ""
+
+        # Party tab state, the tab itself is built on first selection
+        self.dynamons = Roster()
+        self.roster_view = None
+        self.sprites = None
+        self.game_data = None
+        self.map_index = None
+        self.item_vars = {
+            "Heal Spray": tk.IntVar(value=0),
+            "Discatch Special": tk.IntVar(value=0),
+            "Unlimited Snacks": tk.IntVar(value=0),
+        }
 
         self.create_widgets()
         self.set_default_values()
@@ -50,6 +83,11 @@ class SaveEditor:
 
         ttk.Button(file_frame, text="Load Save", command=self.load_file).pack(side=tk.LEFT, padx=5)
         ttk.Button(file_frame, text="Save Changes", command=self.save_file).pack(side=tk.LEFT, padx=5)
+        ttk.Button(file_frame, text="Undo", command=self.undo).pack(side=tk.LEFT, padx=5)
+        ttk.Button(file_frame, text="Redo", command=self.redo).pack(side=tk.LEFT, padx=5)
+        self.root.bind("<Control-z>", lambda event: self.undo())
+        self.root.bind("<Control-y>", lambda event: self.redo())
+        self.root.bind("<Control-Z>", lambda event: self.redo())
         # New button for loading default save from URL
         ttk.Button(file_frame, text="Load Default Save from URL", command=self.load_default_from_url).pack(side=tk.LEFT, padx=5)
         ttk.Button(file_frame, text="About", command=self.show_about).pack(side=tk.RIGHT, padx=5)
@@ -58,35 +96,58 @@ class SaveEditor:
         self.status_var = tk.StringVar()
         status_label = ttk.Label(self.root, textvariable=self.status_var)
         status_label.pack(pady=5)
+
+        # Timing breakdown of the last operation, filled in while profiling
+        self.timing_var = tk.StringVar()
+        ttk.Label(self.root, textvariable=self.timing_var, relief=tk.SUNKEN, anchor=tk.W).pack(side=tk.BOTTOM, fill=tk.X)
+        profiler.listener = self.timing_var.set
         
-        # Main Content
-        notebook = ttk.Notebook(self.root)
-        notebook.pack(fill=tk.BOTH, expand=True)
-
-        # Player Tab
-        player_frame = ttk.Frame(notebook)
-        self.create_player_tab(player_frame)
-        notebook.add(player_frame, text="Player")
-
-        # Items Tab
-        items_frame = ttk.Frame(notebook)
-        self.create_items_tab(items_frame)
-        notebook.add(items_frame, text="Items")
-
-        # Party Tab
-        party_frame = ttk.Frame(notebook)
-        self.create_party_tab(party_frame)
-        notebook.add(party_frame, text="Party")
-
-        # Debug Tab
-        debug_frame = ttk.Frame(notebook)
-        self.create_debug_tab(debug_frame)
-        notebook.add(debug_frame, text="Advanced")
-
-        # Whole Thing Editor Tab
-        whole_thing_frame = ttk.Frame(notebook)
-        self.create_whole_thing_tab(whole_thing_frame)
-        notebook.add(whole_thing_frame, text="Whole Thing Editor")
+        # Main Content, each tab is filled in the first time it's selected
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        self.tab_builders = {}
+        tabs = (
+            ("Player", self.create_player_tab),
+            ("Items", self.create_items_tab),
+            ("Party", self.create_party_tab),
+            ("Advanced", self.create_debug_tab),
+            ("Whole Thing Editor", self.create_whole_thing_tab),
+        )
+        for text, builder in tabs:
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=text)
+            self.tab_builders[str(frame)] = builder
+        self.notebook.bind("<<NotebookTabChanged>>", lambda event: self.build_tab(self.notebook.select()))
+        self.build_tab(self.notebook.select())
+
+    def build_tab(self, tab):
+        builder = self.tab_builders.pop(str(tab), None)
+        if builder is not None:
+            with profiler.span(f"build_{builder.__name__}"):
+                builder(self.notebook.nametowidget(tab))
+
+    def undo(self):
+        self.step_history(undo=True)
+
+    def redo(self):
+        self.step_history(undo=False)
+
+    def step_history(self, undo):
+        if self.notebook.tab(self.notebook.select(), "text") == "Whole Thing Editor":
+            edit = self.wte_history.undo() if undo else self.wte_history.redo()
+            if edit is not None:
+                self.wte_status_bar.config(text=f"{'Undid' if undo else 'Redid'}: {edit.label}")
+            return
+        # Pending edits become history entries first, so undo reverts them
+        self.update_dynamons_from_ui()
+        self.record_player_edits()
+        edit = self.history.undo() if undo else self.history.redo()
+        if edit is None:
+            self.status_var.set(f"Nothing to {'undo' if undo else 'redo'}")
+            return
+        if self.roster_view is not None:
+            self.roster_view.reload()
+        self.status_var.set(f"{'Undid' if undo else 'Redid'}: {edit.label}")
 
     def create_whole_thing_tab(self, frame):
         # --- UI Elements ---
@@ -99,6 +160,16 @@ class SaveEditor:
         ttk.Button(wte_button_frame, text="Save", command=self.wte_save_file).pack(side=tk.LEFT, padx=5)
         ttk.Button(wte_button_frame, text="Save As...", command=self.wte_save_file_as).pack(side=tk.LEFT, padx=5)
         ttk.Button(wte_button_frame, text="Import", command=self.wte_open_file).pack(side=tk.LEFT, padx=5)
+        self.wte_pretty = tk.BooleanVar(value=False)
+        ttk.Checkbutton(wte_button_frame, text="Pretty-print", variable=self.wte_pretty).pack(side=tk.LEFT, padx=5)
+
+        # Search box, Enter jumps to the next match
+        self.wte_search_var = tk.StringVar()
+        search_entry = ttk.Entry(wte_button_frame, textvariable=self.wte_search_var)
+        search_entry.pack(side=tk.RIGHT, padx=5)
+        ttk.Label(wte_button_frame, text="Search:").pack(side=tk.RIGHT)
+        search_entry.bind("<KeyRelease>", self.wte_search)
+        search_entry.bind("<Return>", self.wte_search_next)
 
 
         # Treeview for key-value editing
@@ -113,59 +184,130 @@ class SaveEditor:
 
         # --- Bindings ---
         self.wte_tree.bind("<Double-1>", self.wte_on_double_click)
-
-    def wte_populate_tree(self, parent, dictionary):
-        for key, value in dictionary.items():
-            if isinstance(value, dict):
-                node = self.wte_tree.insert(parent, 'end', text=key, open=True)
-                self.wte_populate_tree(node, value)
+        self.wte_tree.bind("<<TreeviewOpen>>", self.wte_on_open)
+
+    def wte_value_at(self, path):
+        value = self.wte_data
+        for key in path:
+            value = value[key]
+        return value
+
+    def wte_assign(self, path, value):
+        # Undo/redo target: put value back at path and show it in the tree
+        import lazy_json
+        self.wte_value_at(path[:-1])[path[-1]] = value
+        try:
+            self.wte_reveal(path)
+        except (StopIteration, KeyError):
+            return
+        self.wte_tree.set(self.wte_tree.focus(), "Value", lazy_json.display_value(value))
+
+    @profiler.timed("populate_tree")
+    def wte_populate_tree(self, parent, container, path=()):
+        import lazy_json
+        # Only one level is inserted, containers get a dummy child and are
+        # filled in by wte_on_open when first expanded
+        is_object = lazy_json.is_object(container)
+        items = container.items() if is_object else enumerate(container)
+        for key, value in items:
+            text = key if is_object else f"[{key}]"
+            if lazy_json.is_container(value):
+                node = self.wte_tree.insert(parent, 'end', text=text)
+                if value:
+                    self.wte_tree.insert(node, 'end', text="...")
+                    self.wte_unloaded.add(node)
             else:
-                self.wte_tree.insert(parent, 'end', text=key, values=(value,))
+                node = self.wte_tree.insert(parent, 'end', text=text, values=(lazy_json.display_value(value),))
+            self.wte_paths[node] = path + (key,)
+
+    def wte_on_open(self, event):
+        self.wte_expand(self.wte_tree.focus())
+
+    def wte_expand(self, node):
+        if node not in self.wte_unloaded:
+            return
+        self.wte_unloaded.discard(node)
+        self.wte_tree.delete(*self.wte_tree.get_children(node))
+        path = self.wte_paths[node]
+        self.wte_populate_tree(node, self.wte_value_at(path), path)
+
+    def wte_reveal(self, path):
+        """ Expand the tree down to path and select that node """
+        node = ''
+        for key in path:
+            self.wte_expand(node)
+            if node:
+                self.wte_tree.item(node, open=True)
+            node = next(child for child in self.wte_tree.get_children(node) if self.wte_paths[child][-1] == key)
+        self.wte_tree.selection_set(node)
+        self.wte_tree.focus(node)
+        self.wte_tree.see(node)
+
+    def wte_build_index(self, path):
+        # Runs on a worker thread, the result is picked up by wte_search
+        from search_index import SearchIndex
+        try:
+            index = SearchIndex.load_or_build(path)
+        except Exception:
+            return # Not indexable, searching just stays unavailable
+        if path == self.wte_current_file_path:
+            self.wte_index = index
+
+    def wte_search(self, event=None):
+        query = self.wte_search_var.get()
+        if query == self.wte_query and self.wte_matches:
+            return # Keep the position when Enter cycles through matches
+        if self.wte_index is None:
+            self.wte_status_bar.config(text="Search index is still being built...")
+            return
+        self.wte_query = query
+        self.wte_matches = self.wte_index.search(query)
+        self.wte_status_bar.config(text=f"{len(self.wte_matches)} matches for '{query}'" if query else "Ready")
+
+    def wte_search_next(self, event=None):
+        if not self.wte_matches:
+            self.wte_search()
+        if self.wte_matches:
+            path = self.wte_matches.pop(0)
+            self.wte_matches.append(path)
+            try:
+                self.wte_reveal(path)
+            except (StopIteration, KeyError):
+                self.wte_status_bar.config(text=f"Match no longer exists: {path}")
+        return "break"
 
     def wte_open_file(self):
         path = filedialog.askopenfilename()
         if not path:
             return
         
+        import lazy_json
         try:
-            with open(path, 'rb') as f:
-                encoded_content = f.read()
-            
-            decoded_content = base64.b64decode(encoded_content).decode('utf-8')
-            self.wte_data = json.loads(decoded_content)
-
-            # Clear existing tree
-            for i in self.wte_tree.get_children():
-                self.wte_tree.delete(i)
-
-            self.wte_populate_tree('' , self.wte_data)
+            with profiler.span("wte_open_file"):
+                # Subtrees are only decoded once they're expanded or saved
+                with profiler.span("decode"):
+                    self.wte_data = lazy_json.load_file(path)
+
+                # Clear existing tree
+                with profiler.span("clear_tree"):
+                    self.wte_tree.delete(*self.wte_tree.get_children())
+                self.wte_paths = {}
+                self.wte_unloaded = set()
+
+                self.wte_populate_tree('' , self.wte_data)
             
             self.wte_current_file_path = path
+            self.wte_history.clear()
             self.wte_status_bar.config(text=f"Opened: {self.wte_current_file_path}")
+
+            self.wte_index = None
+            self.wte_matches = []
+            self.wte_query = ""
+            threading.Thread(target=self.wte_build_index, args=(path,), daemon=True).start()
         except Exception as e:
             messagebox.showerror("Error Opening File", f"Could not read or decode the file as Base64/JSON:\n{e}")
             self.wte_status_bar.config(text="Error opening file")
 
-    def wte_tree_to_dict(self, parent):
-        dictionary = {}
-        for node_id in self.wte_tree.get_children(parent):
-            key = self.wte_tree.item(node_id, 'text')
-            children = self.wte_tree.get_children(node_id)
-            if children: # It's a category (dict)
-                dictionary[key] = self.wte_tree_to_dict(node_id)
-            else: # It's a key-value pair
-                value = self.wte_tree.item(node_id, 'values')[0]
-                # Try to convert back to original type (int, float, bool)
-                if value.isdigit():
-                    dictionary[key] = int(value)
-                elif value.replace('.','',1).isdigit():
-                    dictionary[key] = float(value)
-                elif value.lower() in ['true', 'false']:
-                    dictionary[key] = value.lower() == 'true'
-                else:
-                    dictionary[key] = value
-        return dictionary
-
     def wte_save_file(self):
         if not self.wte_current_file_path:
             self.wte_save_file_as()
@@ -178,22 +320,37 @@ class SaveEditor:
             return
         self.wte_write_to_path(path)
         self.wte_current_file_path = path
-        self.wte_status_bar.config(text=f"Saved to: {self.wte_current_file_path}")
 
     def wte_write_to_path(self, path):
-        try:
-            self.wte_data = self.wte_tree_to_dict('')
-            json_content = json.dumps(self.wte_data, indent=4)
-            encoded_content = base64.b64encode(json_content.encode('utf-8'))
-            
-            with open(path, 'wb') as f:
-                f.write(encoded_content)
-            
+        import lazy_json
+        # Only the edited containers are copied, the worker encodes the rest straight from the source buffer
+        with profiler.span("wte_snapshot"):
+            data = lazy_json.snapshot(self.wte_data)
+        indent = 4 if self.wte_pretty.get() else None
+        span = profiler.span("wte_write_to_path")  # Timed on the worker, summarised back here
+
+        def write():
+            import base64
+            from atomic_write import write_atomic
+            with span:
+                with profiler.span("encode"):
+                    json_content = lazy_json.dumps(data, indent=indent)
+                    encoded_content = base64.b64encode(json_content)
+                with profiler.span("write"):
+                    write_atomic(path, encoded_content)
+
+        def done(result):
+            profiler.report(span)
             self.wte_status_bar.config(text=f"Saved: {path}")
-        except Exception as e:
-            messagebox.showerror("Error Saving File", f"Could not construct or save the file:\n{e}")
+
+        def failed(error):
+            profiler.report(span)
+            messagebox.showerror("Error Saving File", f"Could not construct or save the file:\n{error}")
             self.wte_status_bar.config(text="Error saving file")
 
+        self.wte_status_bar.config(text=f"Saving {path}...")
+        self.background_writer().submit(write, done, failed)
+
     def wte_on_double_click(self, event):
         region = self.wte_tree.identify("region", event.x, event.y)
         if region != "cell":
@@ -203,21 +360,31 @@ class SaveEditor:
         if column != "#1": # Only allow editing in the "Value" column
             return
 
+        import lazy_json
         item_id = self.wte_tree.focus()
-        if not self.wte_tree.get_children(item_id): # Ensure it's a leaf node
+        path = self.wte_paths[item_id]
+        original_value = self.wte_value_at(path)
+        if not lazy_json.is_container(original_value): # Ensure it's a leaf node
             x, y, width, height = self.wte_tree.bbox(item_id, "Value")
 
             entry_var = tk.StringVar()
             entry = ttk.Entry(self.wte_tree, textvariable=entry_var)
             entry.place(x=x, y=y, width=width, height=height)
             
-            original_value = self.wte_tree.item(item_id, 'values')[0]
-            entry_var.set(original_value)
+            entry_var.set(lazy_json.display_value(original_value))
             entry.focus_force()
 
             def save_edit(event=None):
-                new_value = entry_var.get()
-                self.wte_tree.set(item_id, "Value", new_value)
+                try:
+                    new_value = lazy_json.parse_like(original_value, entry_var.get())
+                except ValueError as e:
+                    messagebox.showerror("Invalid Value", f"Value must be a {type(original_value).__name__}:\n{e}")
+                    return
+                self.wte_value_at(path[:-1])[path[-1]] = new_value
+                self.wte_tree.set(item_id, "Value", lazy_json.display_value(new_value))
+                if new_value != original_value:
+                    self.wte_history.record(f"Edit {'/'.join(map(str, path))}",
+                                            [(self.wte_assign, path, original_value, new_value)])
                 entry.destroy()
 
             entry.bind("<Return>", save_edit)
@@ -231,6 +398,7 @@ class SaveEditor:
         about_win.resizable(False, False)  # make it fixed size
     
         try:
+            from PIL import Image, ImageTk
             logo = Image.open(resource_path("logo.png"))  # replace with your logo filename
             logo = logo.resize((50, 50))  # optional: resize
             self.logo_img = ImageTk.PhotoImage(logo)  # keep a reference
@@ -257,15 +425,35 @@ class SaveEditor:
         for i, (label, key) in enumerate(entries):
             ttk.Label(frame, text=label).grid(row=i, column=0, padx=5, pady=2, sticky=tk.W)
             self.vars[key] = tk.StringVar()
-            ttk.Entry(frame, textvariable=self.vars[key]).grid(row=i, column=1, padx=5, pady=2)
+            entry = ttk.Entry(frame, textvariable=self.vars[key])
+            entry.grid(row=i, column=1, padx=5, pady=2)
+            entry.bind("<FocusOut>", self.record_player_edits)
+            entry.bind("<Return>", self.record_player_edits)
         ttk.Button(frame, text="Max All", command=self.set_max_values).grid(row=len(entries), columnspan=2, pady=5)
 
+    def record_player_edits(self, event=None, label="Edit player values"):
+        """ Turn Player tab values that changed since the last call into one undo step """
+        if not hasattr(self, "vars"):
+            return
+        changes = []
+        for key, var in self.vars.items():
+            old, new = self.player_values.get(key, ""), var.get()
+            if old != new:
+                changes.append((self.set_player_value, key, old, new))
+                self.player_values[key] = new
+        self.history.record(label, changes)
+
+    def set_player_value(self, key, value):
+        self.vars[key].set(value)
+        self.player_values[key] = value
+
+    def start_history(self):
+        """ Forget every undo step, the loaded save is the new starting point """
+        self.history.clear()
+        if hasattr(self, "vars"):
+            self.player_values = {key: var.get() for key, var in self.vars.items()}
+
     def create_items_tab(self, frame):
-        self.item_vars = {
-            "Heal Spray": tk.IntVar(value=0),
-            "Discatch Special": tk.IntVar(value=0),
-            "Unlimited Snacks": tk.IntVar(value=0),
-        }
         for i, (item, var) in enumerate(self.item_vars.items()):
             ttk.Checkbutton(frame, text=item, variable=var).grid(row=i, column=0, sticky=tk.W, padx=5, pady=2)
         ttk.Button(frame, text="Unlock All Maps", command=self.unlock_all_maps).grid(row=4, pady=10)
@@ -276,188 +464,215 @@ class SaveEditor:
         ttk.Button(frame, text="Unlock All Avatars", command=self.unlock_avatars).grid(row=1, pady=5)
         ttk.Button(frame, text="Restore Backup", command=self.restore_backup).grid(row=2, pady=5)
 
-    def create_party_tab(self, frame):
-        container = ttk.Frame(frame)
-        canvas = tk.Canvas(container)
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        self.dynamons_frame = ttk.Frame(canvas)
-
-        self.dynamons_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
-
-        canvas.create_window((0, 0), window=self.dynamons_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        container.pack(fill=tk.BOTH, expand=True)
-        canvas.pack(side="left", fill=tk.BOTH, expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-        self.dynamons = []
-        self.dynamon_widgets = []
-
-    def find_and_parse_dynamons_data(self, root):
-        dynamons_data_string = None
-        for string_tag in root.findall(".//string"):
-            if string_tag.get("name") == "dynamons_worldMONS_DATA":
-                dynamons_data_string = string_tag.text
-                break
-        
-        if dynamons_data_string:
-            self.dynamons = self.parse_dynamons_string(dynamons_data_string)
-
-    def parse_dynamons_string(self, data_string):
-        dynamons = []
-        parts = data_string.strip().split(';')
-        for part in parts:
-            if not part:
-                continue
-            attributes = part.split(',')
-            if len(attributes) < 8: continue
-            dynamon = {
-                "name": attributes[0],
-                "level": attributes[1],
-                "health": attributes[2],
-                "unknown1": attributes[3],
-                "unknown2": attributes[4],
-                "value1": attributes[5],
-                "unknown3": attributes[6],
-                "value2": attributes[7],
-            }
-            dynamons.append(dynamon)
-        return dynamons
+        # Profiling: timings in the status bar, Chrome trace export, cProfile capture
+        self.profiling_var = tk.BooleanVar(value=profiler.enabled)
+        ttk.Checkbutton(frame, text="Profile operations", variable=self.profiling_var,
+                        command=self.toggle_profiling).grid(row=3, sticky=tk.W, pady=5)
+        ttk.Button(frame, text="Export Timeline...", command=self.export_timeline).grid(row=4, pady=5)
+        self.cprofile_button = ttk.Button(frame, text="Start cProfile Capture", command=self.toggle_cprofile)
+        self.cprofile_button.grid(row=5, pady=5)
+        ttk.Button(frame, text="Compare With Save...", command=self.compare_with_file).grid(row=6, pady=5)
+        ttk.Button(frame, text="Compare With Backups", command=self.compare_with_backup).grid(row=7, pady=5)
+        ttk.Checkbutton(frame, text="Reload save when it changes on disk", variable=self.watch_var,
+                        command=self.start_watching).grid(row=8, sticky=tk.W, pady=5)
+
+    def toggle_profiling(self):
+        profiler.enabled = self.profiling_var.get()
+        if not profiler.enabled:
+            self.timing_var.set("")
+
+    def export_timeline(self):
+        if not profiler.events:
+            messagebox.showinfo("Info", "Nothing recorded yet, enable profiling first")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Chrome trace", "*.json")])
+        if path:
+            profiler.export_chrome_trace(path)
+            self.status_var.set(f"Timeline saved to {path} (open it in chrome://tracing or Perfetto)")
+
+    def toggle_cprofile(self):
+        if profiler.cprofile is None:
+            profiler.start_cprofile()
+            self.cprofile_button.config(text="Stop cProfile Capture...")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".prof", filetypes=[("pstats", "*.prof")])
+        if path:
+            profiler.stop_cprofile(path)
+            self.cprofile_button.config(text="Start cProfile Capture")
+            self.status_var.set(f"cProfile data saved to {path}")
 
+    def create_party_tab(self, frame):
+        from roster_view import RosterView
+        from sprites import SpriteCache
+        from sprite_pack import SpriteArchive
+        # Builds ship one packed archive, a source checkout reads images/ directly
+        try:
+            archive = SpriteArchive(resource_path("sprites.pack"))
+        except (OSError, ValueError):
+            archive = None
+        # Decoded Dynamon sprites shared by every Party tab row
+        self.sprites = SpriteCache(resource_path("images"), archive=archive)
+        self.sprites.start_polling(self.root)
+
+        self.roster_view = RosterView(frame, self.get_dynamon_image, self.prefetch_dynamon_images,
+                                      on_edit=self.record_roster_edits)
+        self.roster_view.pack(fill=tk.BOTH, expand=True)
+        self.display_dynamons()
+
+        # Species and level limits for validating edits, compiled off the Tk thread
+        threading.Thread(target=self.load_game_data, daemon=True).start()
+        self.poll_game_data()
+
+    def load_gameplay_cache(self, cls, bundled_name):
+        # Frozen builds ship precompiled caches and no gameplay.dat. A source
+        # checkout compiles gameplay.dat into cache/, keyed by its digest, so
+        # a gamedata.bin left over from building can't go stale there
+        if getattr(sys, "_MEIPASS", None):
+            try:
+                return cls.load(resource_path(bundled_name))
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+        return cls.load_or_build(resource_path("gameplay.dat"))
+
+    def load_game_data(self):
+        # Runs on a worker thread, or directly when max_level needs it first
+        from game_data import GameData
+        try:
+            self.game_data = self.load_gameplay_cache(GameData, "gamedata.bin")
+        except Exception:
+            self.game_data = False  # Nothing to validate against
+
+    def poll_game_data(self):
+        if self.game_data is None:
+            self.root.after(100, self.poll_game_data)
+        elif self.game_data:
+            self.roster_view.set_validator(self.game_data.validate)
+
+    def find_and_parse_dynamons_data(self, document):
+        from save_codecs import SaveFields
+        # Packed values are decoded on first use through the codec registry
+        self.fields = SaveFields(document)
+        roster = self.fields.get("dynamons_worldMONS_DATA")
+        # A roster of nothing but unparsed records is still the one to write back
+        self.dynamons = roster if roster is not None else Roster()
+
+    @profiler.timed()
     def display_dynamons(self):
-        for widget in self.dynamons_frame.winfo_children():
-            widget.destroy()
-        
-        self.dynamon_widgets = []
+        if self.roster_view is not None:
+            self.roster_view.set_roster(self.dynamons)
 
-        for i, dynamon in enumerate(self.dynamons):
-            dynamon_frame = ttk.Frame(self.dynamons_frame, relief=tk.RIDGE, padding=5)
-            dynamon_frame.pack(pady=5, fill=tk.X)
+    def get_dynamon_image(self, dynamon_name, callback=None):
+        return self.sprites.request(dynamon_name, "icon", callback=callback)
 
-            widgets = {}
+    def prefetch_dynamon_images(self, dynamon_names):
+        self.sprites.prefetch(dynamon_names, "icon")
 
-            img_label = self.get_image_label(dynamon["name"], dynamon_frame)
-            img_label.grid(row=0, column=0, rowspan=4, padx=5)
-
-            ttk.Label(dynamon_frame, text="Name:").grid(row=0, column=1, sticky=tk.W)
-            name_entry = ttk.Entry(dynamon_frame)
-            name_entry.insert(0, dynamon["name"])
-            name_entry.grid(row=0, column=2, sticky=tk.W)
-            widgets['name'] = name_entry
-
-            ttk.Label(dynamon_frame, text="Level:").grid(row=1, column=1, sticky=tk.W)
-            level_entry = ttk.Entry(dynamon_frame)
-            level_entry.insert(0, dynamon["level"])
-            level_entry.grid(row=1, column=2, sticky=tk.W)
-            widgets['level'] = level_entry
-            
-            ttk.Label(dynamon_frame, text="Health:").grid(row=2, column=1, sticky=tk.W)
-            health_entry = ttk.Entry(dynamon_frame)
-            health_entry.insert(0, dynamon["health"])
-            health_entry.grid(row=2, column=2, sticky=tk.W)
-            widgets['health'] = health_entry
-            
-            self.dynamon_widgets.append(widgets)
-
-    def get_image_label(self, dynamon_name, parent):
-        try:
-            # Construct the path to the image file
-            image_path = resource_path(f"images/{dynamon_name.lower()}.png")
-
-            # Open and display the image
-            img = Image.open(image_path)
-            img = img.resize((100, 100)) # Resize if necessary
-            img_tk = ImageTk.PhotoImage(img)
-
-            label = ttk.Label(parent, image=img_tk)
-            label.image = img_tk # Keep a reference
-
-        except FileNotFoundError:
-            # If image is not found, show a placeholder
-            img = Image.new('RGB', (100, 100), color = 'gray')
-            img_tk = ImageTk.PhotoImage(img)
-            label = ttk.Label(parent, image=img_tk)
-            label.image = img_tk
-        except Exception as e:
-            label = ttk.Label(parent, text="Image Error")
+    def assign_dynamons(self, key, values):
+        # Undo/redo target, key is (field, indices)
+        field, indices = key
+        column = self.dynamons.columns[field]
+        for index, value in zip(indices, values):
+            column[index] = value
 
-        return label
+    def record_roster_edits(self, changes):
+        for field, index, old, new in changes:
+            self.history.record(f"Edit {self.dynamons.names[index]} {field}",
+                                [(self.assign_dynamons, (field, (index,)), (old,), (new,))])
 
     def update_dynamons_from_ui(self):
-        if not hasattr(self, 'dynamon_widgets'): return
-        for i, widgets in enumerate(self.dynamon_widgets):
-            self.dynamons[i]['name'] = widgets['name'].get()
-            self.dynamons[i]['level'] = widgets['level'].get()
-            self.dynamons[i]['health'] = widgets['health'].get()
+        if self.roster_view is not None:
+            self.roster_view.commit()
 
     def serialize_dynamons_to_string(self):
         if not hasattr(self, 'dynamons'): return ""
-        new_data_parts = []
-        for dynamon in self.dynamons:
-            part = f"{dynamon['name']},{dynamon['level']},{dynamon['health']},{dynamon['unknown1']},{dynamon['unknown2']},{dynamon['value1']},{dynamon['unknown3']},{dynamon['value2']}"
-            new_data_parts.append(part)
-        return ';'.join(new_data_parts) + ';'
+        return self.dynamons.serialize()
 
     def load_default_from_url(self):
         """Load the default save file from a URL"""
+        if self.download is not None:
+            # A second click cancels the running download
+            self.download.cancel()
+            return
+        from downloader import DownloadTask
+        self.status_var.set("Downloading save file... (click again to cancel)")
+        self.download = DownloadTask(self.default_save_url)
+        self.download.start()
+        self.poll_download()
+
+    def poll_download(self):
+        for kind, *args in self.download.events():
+            if kind == "progress":
+                received, total = args
+                done = f"{received * 100 // total}%" if total else f"{received // 1024} KB"
+                self.status_var.set(f"Downloading save file... {done} (click again to cancel)")
+            elif kind == "done":
+                self.download = None
+                self.open_downloaded_save(*args)
+                return
+            elif kind == "cancelled":
+                self.download = None
+                self.status_var.set("Download cancelled")
+                return
+            elif kind == "error":
+                self.download = None
+                self.status_var.set("Error loading from URL")
+                messagebox.showerror("Error", f"Failed to load file from URL:\n{str(args[0])}")
+                return
+        self.root.after(50, self.poll_download)
+
+    def open_downloaded_save(self, xml_content, from_cache):
+        from save_document import SaveDocument
         try:
-            self.status_var.set("Downloading save file...")
-            self.root.update()  # Update the UI to show the status
-            
-            # Download the file from URL
-            with urllib.request.urlopen(self.default_save_url) as response:
-                xml_content = response.read()
-                
             # Parse the XML content
-            tree = ET.parse(io.BytesIO(xml_content))
-            root = tree.getroot()
+            document = SaveDocument.from_bytes(xml_content)
             
             # Create a temporary file to work with
             temp_file = Path("temp_save.xml")
-            tree.write(temp_file, encoding='utf-8', xml_declaration=True)
+            document.write(temp_file)
             
             self.current_file = temp_file
+            self.document = document
             self.create_backup()
             
-            # Load values into GUI
-            for key, var in self.vars.items():
-                element = root.find('.//string[@name="{}"]'.format(key))
-                var.set(element.text if element is not None else "")
-
-            self.find_and_parse_dynamons_data(root)
-            self.display_dynamons()
+            self.show_document()
+            self.start_watching()
                 
+            source = "cache (unchanged on server)" if from_cache else "URL"
             self.status_var.set("Default save file loaded successfully!")
-            messagebox.showinfo("Success", "Default save file loaded from URL!")
+            messagebox.showinfo("Success", f"Default save file loaded from {source}!")
             
         except Exception as e:
             self.status_var.set("Error loading from URL")
             messagebox.showerror("Error", f"Failed to load file from URL:\n{str(e)}")
             self.current_file = None
 
+    def show_document(self):
+        """ Fill the tabs from self.document, which becomes the new undo starting point """
+        for key, var in self.vars.items():
+            var.set(self.document.get(key, ""))
+
+        self.find_and_parse_dynamons_data(self.document)
+        self.display_dynamons()
+        self.start_history()
+        if self.dynamons.unparsed:
+            messagebox.showwarning("Unreadable Dynamons", f"{len(self.dynamons.unparsed)} Dynamon records aren't in the "
+                                   "usual name,number... format. They're left out of the Party tab and saved unchanged.")
+
     # Core functionality
     def load_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("XML files", "*.xml")])
         if not file_path:
             return
+        from save_document import SaveDocument
         try:
-            self.current_file = Path(file_path)
-            self.create_backup()
-            tree = ET.parse(self.current_file)
-            root = tree.getroot()
-            # Load values into GUI
-            for key, var in self.vars.items():
-                element = root.find(f'.//string[@name="{key}"]')
-                var.set(element.text if element is not None else "")
-
-            self.find_and_parse_dynamons_data(root)
-            self.display_dynamons()
+            with profiler.span("load_file"):
+                self.current_file = Path(file_path)
+                with profiler.span("backup"):
+                    self.create_backup()
+                with profiler.span("parse"):
+                    self.document = SaveDocument.load(self.current_file)
+                self.show_document()
+            self.start_watching()
 
             self.status_var.set("Save file loaded successfully!")
             messagebox.showinfo("Success", "Save file loaded successfully!")
@@ -465,89 +680,401 @@ class SaveEditor:
             self.status_var.set("Error loading file")
             messagebox.showerror("Error", f"Failed to load file:\n{str(e)}")
             self.current_file = None
+            self.document = None
+            self.start_watching()
 
     def save_file(self):
-        if not self.current_file:
+        if not self.current_file or self.document is None:
             messagebox.showerror("Error", "No file loaded!")
             return
+        self.update_dynamons_from_ui()
+        rejected = self.roster_view.rejected_edits() if self.roster_view is not None else []
+        if rejected:
+            lines = [f"#{index + 1} {name}: {'; '.join(problems)}" for index, name, problems in rejected[:10]]
+            if len(rejected) > 10:
+                lines.append(f"...and {len(rejected) - 10} more")
+            self.status_var.set("Not saved, fix the invalid Party tab values first")
+            messagebox.showerror("Invalid Dynamons", "These Party tab edits aren't valid, nothing was saved:\n\n"
+                                 + "\n".join(lines))
+            return
         try:
-            tree = ET.parse(self.current_file)
-            root = tree.getroot()
-            # Save basic values
-            for key, var in self.vars.items():
-                element = root.find(f'.//string[@name="{key}"]')
-                if element is not None:
-                    element.text = var.get()
-            # Save items
-            items = root.find('.//string[@name="dynamons_worldITEMS_DATA"]')
-            if items is not None:
-                existing = {k.split(',')[0]: k for k in (items.text or "").split(';') if k}
-                # This logic for item_vars seems incorrect based on the create_items_tab method
-                # Assuming item_vars keys are "Heal Spray", "Discatch Special", "Unlimited Snacks"
-                if self.item_vars["Heal Spray"].get():
-                    existing["heal_spray"] = "heal_spray,9999"
-                if self.item_vars["Discatch Special"].get():
-                    existing["discatch_special"] = "discatch_special,1"
-                if self.item_vars["Unlimited Snacks"].get():
-                    existing["unlimited_snacks"] = "unlimited_snacks,1"
-                items.text = ';'.join(existing.values())
-
-            # Save party data
-            self.update_dynamons_from_ui()
-            new_dynamons_string = self.serialize_dynamons_to_string()
-            for string_tag in root.findall(".//string"):
-                if string_tag.get("name") == "dynamons_worldMONS_DATA":
-                    string_tag.text = new_dynamons_string
-                    break
-
-            tree.write(self.current_file, encoding='utf-8', xml_declaration=True)
-            self.status_var.set("Save file updated!")
-            messagebox.showinfo("Success", "Save file updated!")
+            with profiler.span("save_file"):
+                document = self.document
+                # Save basic values
+                for key, var in self.vars.items():
+                    if key in document:
+                        document.set(key, var.get())
+                # Save items
+                if "dynamons_worldITEMS_DATA" in self.fields:
+                    items = self.fields["dynamons_worldITEMS_DATA"]
+                    if self.item_vars["Heal Spray"].get():
+                        items["heal_spray"] = 9999
+                    if self.item_vars["Discatch Special"].get():
+                        items["discatch_special"] = 1
+                    if self.item_vars["Unlimited Snacks"].get():
+                        items["unlimited_snacks"] = 1
+                    self.fields.mark_modified("dynamons_worldITEMS_DATA")
+
+                # Save party data
+                with profiler.span("serialize_dynamons"):
+                    self.update_dynamons_from_ui()
+                    if "dynamons_worldMONS_DATA" in self.fields:
+                        self.fields["dynamons_worldMONS_DATA"] = self.dynamons
+                    self.fields.flush()
+
+                # Frozen here, rendering and writing happen on the worker
+                with profiler.span("snapshot"):
+                    snapshot = document.snapshot()
         except Exception as e:
             self.status_var.set("Error saving file")
             messagebox.showerror("Error", f"Save failed:\n{str(e)}")
-            self.restore_backup()
+            return
+
+        path = self.current_file
+        store = self.backup_store()
+        span = profiler.span("save_file_write")  # Timed on the worker, summarised back here
+
+        def write():
+            with span:
+                with profiler.span("backup"):
+                    store.snapshot(path)
+                with profiler.span("write"):
+                    return snapshot.write(path)
+
+        def done(snapshot):
+            profiler.report(span)
+            document.saved(snapshot)
+            self.status_var.set("Save file updated!")
+            messagebox.showinfo("Success", "Save file updated!")
+
+        def failed(error):
+            # The file was replaced atomically, so it still holds the previous save
+            profiler.report(span)
+            self.status_var.set("Error saving file")
+            messagebox.showerror("Error", f"Save failed, {path.name} was left unchanged:\n{str(error)}")
+
+        self.status_var.set(f"Saving {path.name}...")
+        self.background_writer().submit(write, done, failed)
+
+    def background_writer(self):
+        if self.writer is None:
+            from atomic_write import BackgroundWriter
+            self.writer = BackgroundWriter(self.root)
+        return self.writer
+
+    def start_watching(self):
+        """ (Re)start watching current_file if that's switched on, stop otherwise """
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        if self.watch_var.get() and self.current_file:
+            from file_watcher import FileWatcher
+            self.watcher = FileWatcher(self.current_file).start()
+            self.poll_watcher(self.watcher)
+
+    def poll_watcher(self, watcher):
+        if watcher is not self.watcher:
+            return  # Stopped or replaced by a watcher on another file
+        if watcher.pending():
+            self.reload_changed_entries()
+        self.root.after(500, self.poll_watcher, watcher)
+
+    def unsaved_entries(self):
+        """ Names of the entries with edits that aren't in the file yet """
+        self.update_dynamons_from_ui()
+        unsaved = set(self.document.dirty) | self.fields.modified
+        for key, var in getattr(self, "vars", {}).items():
+            if key in self.document and var.get() != self.document.get(key):
+                unsaved.add(key)
+        if self.dynamons.serialize() != self.document.get("dynamons_worldMONS_DATA", ""):
+            unsaved.add("dynamons_worldMONS_DATA")
+        return unsaved
+
+    @profiler.timed()
+    def reload_changed_entries(self):
+        """ Take the entries that changed on disk, keeping local edits that don't clash with them """
+        from save_document import SaveDocument
+        from save_codecs import SaveFields
+        from save_diff import changed_entries
+        if self.document is None:
+            return
+        try:
+            disk = SaveDocument.load(self.current_file)
+        except Exception:
+            return  # Caught halfway through a write, the next change event retries
+        changed = set(changed_entries(self.document, disk))
+        if not changed:
+            return  # Our own save, or nothing that matters
+
+        unsaved = self.unsaved_entries()
+        keep = set()
+        conflicts = unsaved & changed
+        if conflicts:
+            names = ", ".join(sorted(key.replace("dynamons_world", "", 1) for key in conflicts))
+            if not messagebox.askyesno(
+                    "Save Changed on Disk",
+                    f"{self.current_file.name} changed on disk, but you have unsaved edits to:\n{names}\n\n"
+                    "Load the values from disk? Choose No to keep your edits, saving will then overwrite the file."):
+                keep = conflicts
+        reloaded = changed - keep
+
+        # Unsaved edits move over to the new document, decoded values that are still current are reused
+        fields = SaveFields(disk)
+        fields.values = {key: value for key, value in self.fields.values.items() if key not in reloaded and key in disk}
+        fields.modified = {key for key in self.fields.modified if key in fields.values}
+        for key in self.document.dirty:
+            if key in disk and key not in reloaded:
+                disk.set(key, self.document.get(key))
+        self.document = disk
+        self.fields = fields
+
+        for key, var in getattr(self, "vars", {}).items():
+            if key in reloaded:
+                var.set(disk.get(key, ""))
+                self.player_values[key] = var.get()
+        if "dynamons_worldMONS_DATA" in reloaded:
+            self.dynamons = fields.get("dynamons_worldMONS_DATA") or Roster()
+            if self.roster_view is not None:
+                self.roster_view.replace_roster(self.dynamons)
+        if reloaded & (set(getattr(self, "vars", ())) | {"dynamons_worldMONS_DATA"}):
+            # Undo steps for those would restore values from before the reload
+            self.history.clear()
+        status = f"Reloaded {len(reloaded)} changed entries from {self.current_file.name}" if reloaded else \
+            f"{self.current_file.name} changed on disk"
+        self.status_var.set(status + (f", kept your edits to {len(keep)} of them" if keep else ""))
+
+    def backup_store(self):
+        if self.backups is None:
+            from backups import BackupStore
+            self.backups = BackupStore(self.backup_dir)
+        return self.backups
 
     def create_backup(self):
         if not self.current_file: return
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_file = self.backup_dir / f"{self.current_file.stem}_{timestamp}.bak"
-        shutil.copy(self.current_file, backup_file)
-        # Keep only last 5 backups
-        backups = sorted(self.backup_dir.glob("*.bak"), key=lambda x: x.stat().st_mtime)
-        for old_backup in backups[:-5]:
-            old_backup.unlink()
+        # Unchanged content is skipped, so this is cheap enough before every save
+        self.backup_store().snapshot(self.current_file)
 
     def restore_backup(self):
-        backups = sorted(self.backup_dir.glob("*.bak"), key=lambda x: x.stat().st_mtime)
-        if not backups:
+        if not self.current_file:
+            messagebox.showerror("Error", "No file loaded!")
+            return
+        entry = self.backup_store().latest(self.current_file)
+        if entry is None:
             messagebox.showinfo("Info", "No backups available")
             return
+        from save_document import SaveDocument
         try:
-            shutil.copy(backups[-1], self.current_file)
-            self.status_var.set(f"Restored backup from {backups[-1].name}")
-            messagebox.showinfo("Restored", f"Restored backup from {backups[-1].name}")
+            self.backup_store().restore(self.current_file, entry)
+            # Saving patches the in-memory document, so it has to be reread or the next save undoes the restore
+            self.document = SaveDocument.load(self.current_file)
+            self.show_document()
+            self.status_var.set(f"Restored backup from {entry['time']}")
+            messagebox.showinfo("Restored", f"Restored backup of {self.current_file.name} from {entry['time']}")
         except Exception as e:
             self.status_var.set("Error restoring backup")
             messagebox.showerror("Error", f"Restore failed:\n{str(e)}")
 
+    def compare_with_file(self):
+        if not self.current_file:
+            messagebox.showerror("Error", "No file loaded!")
+            return
+        path = filedialog.askopenfilename(filetypes=[("Save files", "*.xml *.bak"), ("All files", "*.*")])
+        if not path:
+            return
+        from save_diff import diff_files
+        try:
+            changes = diff_files(path, self.current_file)
+        except Exception as e:
+            messagebox.showerror("Error", f"Compare failed:\n{str(e)}")
+            return
+        self.show_diff(changes, f"{Path(path).name} -> {self.current_file.name}")
+
+    def compare_with_backup(self):
+        if not self.current_file:
+            messagebox.showerror("Error", "No file loaded!")
+            return
+        from save_diff import diff_backups
+        try:
+            # Every snapshot (newest first) and legacy .bak, the newest one usually matches the file
+            groups = diff_backups(self.current_file, self.backup_dir)
+        except Exception as e:
+            messagebox.showerror("Error", f"Compare failed:\n{str(e)}")
+            return
+        if not groups:
+            messagebox.showinfo("Info", "No backups available")
+            return
+        self.show_diff(groups, f"Backups -> {self.current_file.name}")
+
+    def show_diff(self, changes, title):
+        """ changes is a list of Change, or {label: changes} shown as one expandable row per label """
+        from save_diff import format_path, format_value
+        groups = changes if isinstance(changes, dict) else None
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        window.geometry("800x400")
+        tree = ttk.Treeview(window, columns=("change", "path", "old", "new"),
+                            show="tree headings" if groups else "headings")
+        if groups:
+            tree.heading("#0", text="Backup")
+            tree.column("#0", width=220, stretch=False)
+        for column, heading, width in (("change", "Change", 70), ("path", "Entry", 280),
+                                       ("old", "Old", 220), ("new", "New", 220)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, stretch=column != "change")
+        scrollbar = ttk.Scrollbar(window, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        def insert(parent, changes):
+            for change in changes:
+                tree.insert(parent, tk.END, values=(
+                    change.kind, format_path(change.path).replace("dynamons_world", "", 1),
+                    "" if change.kind == "added" else format_value(change.old),
+                    "" if change.kind == "removed" else format_value(change.new),
+                ))
+
+        if groups is None:
+            insert("", changes)
+            self.status_var.set(f"{len(changes)} differences" if changes else "No differences")
+            return
+        opened = False
+        for label, group in groups.items():
+            # Only the newest backup that differs starts expanded
+            item = tree.insert("", tk.END, text=label, values=(f"{len(group)}", "differences" if group else "identical"),
+                               open=bool(group) and not opened)
+            opened = opened or bool(group)
+            insert(item, group)
+        self.status_var.set(f"{sum(1 for group in groups.values() if group)} of {len(groups)} backups differ")
+
     # Feature implementations (placeholders)
     def set_max_values(self):
+        self.record_player_edits()
         for key, var in self.vars.items():
             var.set("999999" if "COINS" in key else "9999")
+        self.record_player_edits(label="Max All")
+
+    def require_map_index(self):
+        if self.document is None:
+            messagebox.showerror("Error", "No file loaded!")
+            return None
+        if self.map_index is None:
+            from map_index import MapIndex
+            try:
+                self.map_index = self.load_gameplay_cache(MapIndex, "maps.bin")
+            except Exception as e:
+                messagebox.showerror("Error", f"Couldn't read map data from gameplay.dat:\n{str(e)}")
+                return None
+        return self.map_index
+
+    def add_save_ids(self, updates):
+        """ Append the missing IDs to each list-valued key, then write them all in one go """
+        from map_index import add_missing
+        added = 0
+        for key, ids in updates.items():
+            if key in self.fields:
+                self.fields[key], count = add_missing(self.fields[key], ids)
+                added += count
+        self.fields.flush()
+        return added
 
     def unlock_all_maps(self):
-        pass
+        index = self.require_map_index()
+        if index is None:
+            return
+        added = self.add_save_ids({
+            "dynamons_worldMAPS_UNLOCKED": index.map_ids(),
+            "dynamons_worldMAP_PACKS_UNLOCKED": index.pack_ids(),
+        })
+        self.status_var.set(f"Unlocked {added} maps and map packs, save to keep the changes")
 
     def complete_events(self):
-        pass
+        index = self.require_map_index()
+        if index is None:
+            return
+        added = self.add_save_ids({"dynamons_worldCOMPLETED_IDS_EVENT": index.event_ids()})
+        self.status_var.set(f"Completed {added} events, save to keep the changes")
 
     def max_level(self):
-        pass
+        if self.document is None:
+            messagebox.showerror("Error", "No file loaded!")
+            return
+        if not self.game_data:
+            self.load_game_data()
+        if not self.game_data:
+            messagebox.showerror("Error", "Max level needs gameplay.dat next to the editor")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Force Max Level")
+        dialog.resizable(False, False)
+        scope = tk.StringVar(value="all")
+        below = tk.StringVar(value=str(self.game_data.max_level))
+        heal = tk.BooleanVar(value=True)
+        ttk.Radiobutton(dialog, text="Every Dynamon", variable=scope, value="all").grid(row=0, column=0, columnspan=2, sticky=tk.W, padx=10, pady=2)
+        ttk.Radiobutton(dialog, text="Current party only", variable=scope, value="party").grid(row=1, column=0, columnspan=2, sticky=tk.W, padx=10, pady=2)
+        ttk.Radiobutton(dialog, text="Below level", variable=scope, value="below").grid(row=2, column=0, sticky=tk.W, padx=10, pady=2)
+        ttk.Entry(dialog, textvariable=below, width=5).grid(row=2, column=1, sticky=tk.W, pady=2)
+        ttk.Checkbutton(dialog, text="Full heal", variable=heal).grid(row=3, column=0, columnspan=2, sticky=tk.W, padx=10, pady=2)
+
+        def apply():
+            try:
+                below_level = int(below.get())
+            except ValueError:
+                messagebox.showerror("Invalid Value", "Level must be a whole number", parent=dialog)
+                return
+            dialog.destroy()
+            self.apply_max_level(scope.get(), below_level, heal.get())
+
+        ttk.Button(dialog, text="Apply", command=apply).grid(row=4, column=0, columnspan=2, pady=10)
+        dialog.grab_set()
+
+    @profiler.timed()
+    def apply_max_level(self, scope, below_level, heal):
+        """ Raise the selected Dynamons to the level cap of the save's game version in one pass """
+        from array import array
+        self.update_dynamons_from_ui()
+        roster = self.dynamons
+        if scope == "party":
+            party = {int(key) for key in self.fields.get("dynamons_worldUSING_MONS") or {}}
+            ids = roster.columns["value2"]
+            indices = [i for i in range(len(roster)) if ids[i] in party]
+        elif scope == "below":
+            indices = roster.select(max_level=below_level - 1)
+        else:
+            indices = None
+
+        game_version = self.document.get("dynamons_worldPREV_GAME_VER")
+        caps = self.game_data.level_caps(roster.names, game_version)
+        before = {field: array('q', roster.columns[field]) for field in ("level", "value1", "health")}
+        capped = roster.raise_levels(caps, indices)
+        if heal:
+            roster.set_column("health", self.game_data.max_hp, capped)
+        # Only the Dynamons that actually changed are kept for undo
+        changes = []
+        for field, old_column in before.items():
+            changed, old, new = column_delta(old_column, roster.columns[field])
+            if changed:
+                changes.append((self.assign_dynamons, (field, changed), old, new))
+        self.history.record("Force Max Level", changes)
+        self.display_dynamons()
+        skipped = (len(roster) if indices is None else len(indices)) - len(capped)
+        self.status_var.set(f"{len(capped)} Dynamons set to level {self.game_data.level_cap(game_version)}"
+                            + (" and fully healed" if heal else "")
+                            + (f", {skipped} skipped (species not in gameplay.dat)" if skipped else "")
+                            + ", save to keep the changes")
 
     def unlock_avatars(self):
         pass
 
+    def report_startup(self, budget=None):
+        self.root.update_idletasks()
+        elapsed = (time.perf_counter() - STARTED) * 1000
+        print(f"time to first window: {elapsed:.1f} ms" + (f" (budget {budget:.0f} ms)" if budget else ""))
+        self.root.destroy()
+        if budget is not None and elapsed > budget:
+            sys.exit(1)
+
     def set_default_values(self):
         defaults = {
             "dynamons_worldPLAYER_COINS": "9185",
@@ -559,6 +1086,7 @@ class SaveEditor:
         for key, value in defaults.items():
             if hasattr(self, "vars") and key in self.vars:
                 self.vars[key].set(value)
+        self.start_history()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -567,4 +1095,10 @@ if __name__ == "__main__":
     except:
         pass  # Skip if icon not available
     app = SaveEditor(root)
+    # --startup-time prints time-to-first-window and quits, --startup-budget=MS
+    # also fails (exit code 1) when that's over budget. For the onefile build
+    # this starts counting after PyInstaller has unpacked itself.
+    budget = next((float(arg.split("=", 1)[1]) for arg in sys.argv if arg.startswith("--startup-budget=")), None)
+    if budget is not None or "--startup-time" in sys.argv:
+        root.after_idle(app.report_startup, budget)
     root.mainloop()
\ No newline at end of file
@@ -1,11 +1,26 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+
+# Pack images/ into one archive so the onefile build extracts a single file
+# instead of 1,100+ PNGs. Icons are stored at the size the Party tab shows.
+sys.path.insert(0, SPECPATH)
+import sprite_pack
+sprite_pack.build(os.path.join(SPECPATH, 'images'), os.path.join(SPECPATH, 'sprites.pack'), {'icon': (100, 100)})
+
+# Species/level tables and the map/event index, precompiled so the build
+# doesn't need to ship or decode gameplay.dat
+import game_data
+import map_index
+game_data.GameData.load_or_build(os.path.join(SPECPATH, 'gameplay.dat')).save(os.path.join(SPECPATH, 'gamedata.bin'))
+map_index.MapIndex.load_or_build(os.path.join(SPECPATH, 'gameplay.dat')).save(os.path.join(SPECPATH, 'maps.bin'))
 
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('images', 'images'), ('logo.png', '.'), ('profile.ico', '.')],
+    datas=[('sprites.pack', '.'), ('gamedata.bin', '.'), ('maps.bin', '.'), ('logo.png', '.'), ('profile.ico', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,90 @@
+from pathlib import Path
+import lazy_json
+from disk_cache import cached_build, read_fields, write_fields
+
+CACHE_VERSION = 1
+
+
+class MapIndex:
+    """ Map, pack, node and event IDs from gameplay.dat with what unlocks them
+
+    hubMap.mapNodes, mapPacks, mapNodes and specialQuest.events add up to a
+    couple of MB of JSON, so they're walked once and cached with marshal in
+    cache/maps_<sha256>.bin. Every list is already in progression order:
+    maps as laid out on the hub, packs by map then advance, events along
+    their nextEvent chains.
+    """
+
+    def __init__(self, maps, packs, nodes, events):
+        self.maps = maps  # [(id, type, completion ids it needs, node id it needs or None)]
+        self.packs = packs  # [(id, map, advance)]
+        self.nodes = nodes  # [(id, map, pack, connected node, boss completion id, pack the boss unlocks)]
+        self.events = events  # [(completion id, next event completion id)]
+
+    @classmethod
+    def build(cls, data):
+        maps = []
+        for node in data["hubMap"]["mapNodes"]:
+            needs = node.get("availIfCompletedId") or []
+            if isinstance(needs, str):
+                needs = [needs]
+            advanced = node.get("availIfAdvanced")
+            maps.append((node["id"], node.get("type", "map"), list(needs), int(advanced) if advanced else None))
+
+        map_order = {entry[0]: i for i, entry in enumerate(maps)}
+        packs = sorted(((pack["id"], pack["map"], pack.get("advance", 0)) for pack in data["mapPacks"]),
+                       key=lambda pack: (map_order.get(pack[1], len(map_order)), pack[2]))
+
+        nodes = []
+        for node in data["mapNodes"]:
+            boss = node.get("bossBattle") or {}
+            nodes.append((node["id"], node["map"], node["pack"], node.get("connect"),
+                          boss.get("completionID"), boss.get("unlocksPack")))
+
+        events = []
+        seen = set()
+        quests = {event["completionID"]: event.get("nextEvent") for event in data["specialQuest"]["events"]}
+        followers = {follower for follower in quests.values() if follower}
+        # Chains first, from events nothing leads to; then anything left in a loop
+        for start in [e for e in quests if e not in followers] + list(quests):
+            event = start
+            while event in quests and event not in seen:
+                seen.add(event)
+                events.append((event, quests[event]))
+                event = quests[event]
+        return cls(maps, packs, nodes, events)
+
+    def fields(self):
+        return self.maps, self.packs, self.nodes, self.events
+
+    @classmethod
+    def load(cls, path):
+        return cls(*read_fields(path, CACHE_VERSION))
+
+    def save(self, path):
+        write_fields(path, CACHE_VERSION, self.fields())
+
+    @classmethod
+    def load_or_build(cls, path, cache_dir=Path("cache")):
+        return cls(*cached_build(path, "maps", CACHE_VERSION,
+                                 lambda source: cls.build(lazy_json.load_file(source)).fields(), cache_dir))
+
+    def map_ids(self):
+        return [entry[0] for entry in self.maps]
+
+    def pack_ids(self):
+        return [entry[0] for entry in self.packs]
+
+    def event_ids(self):
+        return [entry[0] for entry in self.events]
+
+
+def add_missing(values, ids):
+    """ values with every id it doesn't have yet appended, in order; the count added """
+    present = set(values)
+    missing = []
+    for id in ids:
+        if id not in present:
+            present.add(id)
+            missing.append(id)
+    return values + missing, len(missing)
@@ -1,10 +1,12 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import xml.etree.ElementTree as ET
 from PIL import Image, ImageTk
 import requests
 from io import BytesIO
+from save_document import SaveDocument
+from atomic_write import BackgroundWriter
+from roster import Roster
 
 class DynamonPartyEditor(tk.Tk):
     def __init__(self):
@@ -13,9 +15,10 @@ class DynamonPartyEditor(tk.Tk):
         self.geometry("800x600")
 
         self.current_file_path = None
-        self.tree = None
+        self.document = None
         self.dynamons_data_string = None
-        self.dynamons = []
+        self.dynamons = Roster()
+        self.writer = BackgroundWriter(self)
 
         # --- UI Elements ---
         self.main_frame = ttk.Frame(self)
@@ -43,7 +46,7 @@ class DynamonPartyEditor(tk.Tk):
             return
 
         try:
-            self.tree = ET.parse(path)
+            self.document = SaveDocument.load(path)
             self.current_file_path = path
             self.status_bar.config(text=f"Opened: {self.current_file_path}")
             self.find_and_parse_dynamons_data()
@@ -52,34 +55,9 @@ class DynamonPartyEditor(tk.Tk):
             messagebox.showerror("Error", f"Failed to load or parse XML file: {e}")
 
     def find_and_parse_dynamons_data(self):
-        root = self.tree.getroot()
-        for string_tag in root.findall(".//string"):
-            if string_tag.get("name") == "dynamons_worldMONS_DATA":
-                self.dynamons_data_string = string_tag.text
-                break
-        
+        self.dynamons_data_string = self.document.get("dynamons_worldMONS_DATA")
         if self.dynamons_data_string:
-            self.dynamons = self.parse_dynamons_string(self.dynamons_data_string)
-
-    def parse_dynamons_string(self, data_string):
-        dynamons = []
-        parts = data_string.strip().split(';')
-        for part in parts:
-            if not part:
-                continue
-            attributes = part.split(',')
-            dynamon = {
-                "name": attributes[0],
-                "level": attributes[1],
-                "health": attributes[2],
-                "unknown1": attributes[3],
-                "unknown2": attributes[4],
-                "value1": attributes[5],
-                "unknown3": attributes[6],
-                "value2": attributes[7],
-            }
-            dynamons.append(dynamon)
-        return dynamons
+            self.dynamons = Roster.parse(self.dynamons_data_string)
 
     def display_dynamons(self):
         # Clear existing widgets
@@ -129,19 +107,15 @@ class DynamonPartyEditor(tk.Tk):
 
     def update_dynamons_from_ui(self):
         for i, widgets in enumerate(self.dynamon_widgets):
-            self.dynamons[i]['name'] = widgets['name'].get()
-            self.dynamons[i]['level'] = widgets['level'].get()
-            self.dynamons[i]['health'] = widgets['health'].get()
+            self.dynamons.names[i] = widgets['name'].get()
+            self.dynamons.levels[i] = int(widgets['level'].get())
+            self.dynamons.healths[i] = int(widgets['health'].get())
 
     def serialize_dynamons_to_string(self):
-        new_data_parts = []
-        for dynamon in self.dynamons:
-            part = f"{dynamon['name']},{dynamon['level']},{dynamon['health']},{dynamon['unknown1']},{dynamon['unknown2']},{dynamon['value1']},{dynamon['unknown3']},{dynamon['value2']}"
-            new_data_parts.append(part)
-        return ';'.join(new_data_parts) + ';'
+        return self.dynamons.serialize()
 
     def save_xml(self):
-        if not self.current_file_path or not self.tree:
+        if not self.current_file_path or self.document is None:
             messagebox.showerror("Error", "No XML file loaded.")
             return
 
@@ -149,25 +123,31 @@ class DynamonPartyEditor(tk.Tk):
             self.update_dynamons_from_ui()
             new_dynamons_string = self.serialize_dynamons_to_string()
 
-            root = self.tree.getroot()
-            updated = False
-            for string_tag in root.findall(".//string"):
-                if string_tag.get("name") == "dynamons_worldMONS_DATA":
-                    string_tag.text = new_dynamons_string
-                    updated = True
-                    break
-            
-            if not updated:
+            if "dynamons_worldMONS_DATA" not in self.document:
                 messagebox.showerror("Error", "Could not find the dynamons_worldMONS_DATA string in the XML.")
                 return
 
-            self.tree.write(self.current_file_path, encoding='utf-8', xml_declaration=True)
-            self.status_bar.config(text=f"Saved to: {self.current_file_path}")
-            messagebox.showinfo("Success", "File saved successfully!")
-
+            self.document.set("dynamons_worldMONS_DATA", new_dynamons_string)
+            snapshot = self.document.snapshot()
         except Exception as e:
             messagebox.showerror("Error Saving File", f"Could not save the file:\n{e}")
             self.status_bar.config(text="Error saving file")
+            return
+
+        document, path = self.document, self.current_file_path
+
+        def done(snapshot):
+            document.saved(snapshot)
+            self.status_bar.config(text=f"Saved to: {path}")
+            messagebox.showinfo("Success", "File saved successfully!")
+
+        def failed(error):
+            messagebox.showerror("Error Saving File", f"Could not save the file:\n{error}")
+            self.status_bar.config(text="Error saving file")
+
+        # Written atomically on a worker thread, the window stays responsive
+        self.status_bar.config(text=f"Saving {path}...")
+        self.writer.submit(lambda: snapshot.write(path), done, failed)
 
 
 if __name__ == "__main__":
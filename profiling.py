@@ -0,0 +1,140 @@
+from collections import deque
+import functools
+import os
+import threading
+import time
+
+
+class NullSpan:
+    """ Shared do-nothing span handed out while profiling is off """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    __slots__ = ("profiler", "name", "start", "duration", "children")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.children = {}  # child name -> total seconds
+        self.duration = None  # Seconds, once the span has finished
+
+    def __enter__(self):
+        self.profiler.stack().append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = self.duration = time.perf_counter() - self.start
+        stack = self.profiler.stack()
+        stack.pop()
+        self.profiler.record(self, duration)
+        if stack:
+            parent = stack[-1].children
+            parent[self.name] = parent.get(self.name, 0.0) + duration
+        elif threading.current_thread() is threading.main_thread():
+            self.profiler.finish(self, duration)
+        return False
+
+
+class Profiler:
+    """ Nested timing spans, a Chrome trace timeline and optional cProfile
+
+    With profiling off, span() returns a shared no-op object and timed()
+    wrappers only check one attribute, so instrumentation can stay in place.
+    Spans finishing at the top level of the Tk (main) thread are summarised
+    for the status bar through listener(text); a worker's spans are handed
+    back to the Tk thread with report().
+    """
+
+    def __init__(self, max_events=100000):
+        self.enabled = bool(os.environ.get("DYNAMONS_PROFILE"))
+        self.events = deque(maxlen=max_events)
+        self.local = threading.local()
+        self.origin = time.perf_counter()
+        self.listener = None
+        self.last_breakdown = ""
+        self.cprofile = None
+
+    def stack(self):
+        try:
+            return self.local.stack
+        except AttributeError:
+            self.local.stack = []
+            return self.local.stack
+
+    def span(self, name):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def timed(self, name=None):
+        """ Decorator wrapping every call of a function in a span """
+        def decorate(func):
+            label = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def record(self, span, duration):
+        # Chrome trace "complete" event, timestamps in microseconds
+        self.events.append({
+            "name": span.name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+            "ts": (span.start - self.origin) * 1e6, "dur": duration * 1e6,
+        })
+
+    def finish(self, span, duration):
+        parts = sorted(span.children.items(), key=lambda item: item[1], reverse=True)
+        other = duration - sum(span.children.values())
+        if parts and other >= 0.0005:
+            parts.append(("other", other))
+        details = ", ".join(f"{name} {seconds * 1000:.1f}" for name, seconds in parts)
+        self.last_breakdown = f"{span.name} {duration * 1000:.1f} ms" + (f" ({details})" if details else "")
+        if self.listener is not None:
+            self.listener(self.last_breakdown)
+
+    def report(self, span):
+        """ Summarise a top-level span that ran on a worker, call from the Tk thread """
+        if isinstance(span, Span) and span.duration is not None:
+            self.finish(span, span.duration)
+
+    def clear(self):
+        self.events.clear()
+        self.origin = time.perf_counter()
+
+    def export_chrome_trace(self, path):
+        """ Timeline for chrome://tracing or Perfetto """
+        import json
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": list(self.events), "displayTimeUnit": "ms"}, f)
+
+    def start_cprofile(self):
+        if self.cprofile is None:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def stop_cprofile(self, path):
+        """ Stop the capture and dump pstats data, readable with snakeviz or pstats """
+        if self.cprofile is None:
+            return
+        self.cprofile.disable()
+        self.cprofile.dump_stats(path)
+        self.cprofile = None
+
+
+profiler = Profiler()
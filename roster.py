@@ -0,0 +1,181 @@
+from array import array
+from operator import itemgetter
+
+# Column order of a dynamons_worldMONS_DATA record
+FIELDS = ("name", "level", "health", "unknown1", "unknown2", "value1", "unknown3", "value2")
+INT_FIELDS = FIELDS[1:]
+
+
+def is_int(text):
+    """ True for integers spelled the way str(int) writes them back, so records round-trip exactly """
+    try:
+        return str(int(text)) == text
+    except ValueError:
+        return False
+
+
+class Roster:
+    """ Dynamons from dynamons_worldMONS_DATA stored as parallel columns
+
+    Every numeric column is an array('q'), names and the untouched tail of
+    each record (anything after the eighth field) are plain lists, so the
+    whole roster can be edited, filtered and serialized column-wise.
+    Records that don't fit the columns (too short, or a number field that
+    isn't a plain integer) are kept verbatim in unparsed and written back where
+    they were.
+    """
+
+    def __init__(self):
+        self.columns = {field: array('q') for field in INT_FIELDS}
+        self.columns["name"] = []
+        self.tails = []
+        self.unparsed = []  # [(number of Dynamons before it, record text)]
+        self.trailing_separator = True
+
+    @classmethod
+    def parse(cls, data_string):
+        roster = cls()
+        data_string = data_string.strip()
+        roster.trailing_separator = data_string.endswith(';')
+        records = []
+        for part in data_string.split(';'):
+            if not part:
+                continue
+            record = part.split(',', 8)
+            if len(record) >= 8 and all(is_int(value) for value in record[1:8]):
+                records.append(record)
+            else:
+                roster.unparsed.append((len(records), part))
+        if not records:
+            return roster
+
+        transposed = list(zip(*(record[:8] for record in records)))
+        roster.columns["name"] = list(transposed[0])
+        for field, values in zip(INT_FIELDS, transposed[1:]):
+            roster.columns[field] = array('q', map(int, values))
+        roster.tails = ["," + record[8] if len(record) > 8 else "" for record in records]
+        return roster
+
+    def serialize(self):
+        if not self and not self.unparsed:
+            return ""
+        columns = [self.columns["name"]]
+        columns += [map(str, self.columns[field]) for field in INT_FIELDS]
+        records = list(map(str.__add__, map(",".join, zip(*columns)), self.tails))
+        for position, text in reversed(self.unparsed):
+            records.insert(min(position, len(records)), text)
+        data = ";".join(records)
+        return data + ";" if self.trailing_separator else data
+
+    def __len__(self):
+        return len(self.tails)
+
+    def __getitem__(self, index):
+        return {field: self.columns[field][index] for field in FIELDS}
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def names(self):
+        return self.columns["name"]
+
+    @property
+    def levels(self):
+        return self.columns["level"]
+
+    @property
+    def healths(self):
+        return self.columns["health"]
+
+    def append(self, name, level, health, unknown1=-1, unknown2=-1, value1=0, unknown3=-1, value2=0, tail=","):
+        self.columns["name"].append(name)
+        for field, value in zip(INT_FIELDS, (level, health, unknown1, unknown2, value1, unknown3, value2)):
+            self.columns[field].append(int(value))
+        self.tails.append(tail)
+
+    def select(self, names=None, min_level=None, max_level=None, predicate=None):
+        """ Indices of the Dynamons matching every given condition """
+        indices = range(len(self))
+        if names is not None:
+            names = set(names)
+            column = self.columns["name"]
+            indices = [i for i in indices if column[i] in names]
+        if min_level is not None:
+            column = self.columns["level"]
+            indices = [i for i in indices if column[i] >= min_level]
+        if max_level is not None:
+            column = self.columns["level"]
+            indices = [i for i in indices if column[i] <= max_level]
+        if predicate is not None:
+            indices = [i for i in indices if predicate(self[i])]
+        return list(indices)
+
+    def set_column(self, field, value, indices=None):
+        """ Set one field to value for every Dynamon, or only those at indices """
+        column = self.columns[field]
+        if field != "name":
+            value = int(value)
+        if indices is None:
+            if field == "name":
+                column[:] = [value] * len(column)
+            else:
+                column[:] = array('q', [value]) * len(column)
+            return
+        for i in indices:
+            column[i] = value
+
+    def set_levels(self, level, indices=None):
+        self.set_column("level", level, indices)
+
+    def raise_levels(self, caps, indices=None):
+        """ Raise each Dynamon to caps[name], never lowering one
+
+        value1 is the XP earned towards the next level, so a Dynamon that
+        is raised starts its new level with 0, like every Dynamon the game
+        itself has levelled up to the cap. Dynamons whose species isn't in
+        caps are left alone. Returns the indices of the Dynamons that had
+        a cap, raised or already there.
+        """
+        names = self.columns["name"]
+        levels = self.columns["level"]
+        xp = self.columns["value1"]
+        if indices is None:
+            # One pass over the whole column
+            targets = [caps.get(name) for name in names]
+            raised = [cap is not None and level < cap for level, cap in zip(levels, targets)]
+            self.columns["level"] = array('q', [cap if up else level for level, cap, up in zip(levels, targets, raised)])
+            self.columns["value1"] = array('q', [0 if up else value for value, up in zip(xp, raised)])
+            return [i for i, cap in enumerate(targets) if cap is not None]
+        capped = []
+        for i in indices:
+            cap = caps.get(names[i])
+            if cap is not None:
+                if levels[i] < cap:
+                    levels[i] = cap
+                    xp[i] = 0
+                capped.append(i)
+        return capped
+
+    def take(self, indices):
+        """ New roster holding the Dynamons at indices, in that order, without the unparsed records """
+        roster = Roster()
+        roster.trailing_separator = self.trailing_separator
+        if not indices:
+            return roster
+        getter = itemgetter(*indices) if len(indices) > 1 else (lambda column: (column[indices[0]],))
+        roster.columns["name"] = list(getter(self.columns["name"]))
+        for field in INT_FIELDS:
+            roster.columns[field] = array('q', getter(self.columns[field]))
+        roster.tails = list(getter(self.tails))
+        return roster
+
+    def filter(self, **conditions):
+        return self.take(self.select(**conditions))
+
+    def sort(self, field="level", reverse=False):
+        column = self.columns[field]
+        order = sorted(range(len(self)), key=column.__getitem__, reverse=reverse)
+        sorted_roster = self.take(order)
+        self.columns = sorted_roster.columns
+        self.tails = sorted_roster.tails
@@ -0,0 +1,236 @@
+import tkinter as tk
+from tkinter import ttk
+from roster import Roster
+from profiling import profiler
+
+ROW_HEIGHT = 122
+
+
+class RosterRow:
+    """ One reusable row of widgets, rebound to whichever Dynamon is on screen """
+
+    def __init__(self, parent, get_image, validate, commit=None):
+        self.get_image = get_image
+        self.validate = validate
+        self.index = None
+        self.name = None
+        self.frame = ttk.Frame(parent, relief=tk.RIDGE, padding=5)
+        self.image_label = ttk.Label(self.frame)
+        self.image_label.grid(row=0, column=0, rowspan=4, padx=5)
+
+        self.vars = {}
+        for row, (label, field) in enumerate((("Name:", "name"), ("Level:", "level"), ("Health:", "health"))):
+            ttk.Label(self.frame, text=label).grid(row=row, column=1, sticky=tk.W)
+            self.vars[field] = tk.StringVar()
+            entry = ttk.Entry(self.frame, textvariable=self.vars[field])
+            entry.grid(row=row, column=2, sticky=tk.W)
+            if commit is not None:
+                # Finished edits go into the roster right away so they can be undone
+                entry.bind("<FocusOut>", lambda event: commit())
+                entry.bind("<Return>", lambda event: commit())
+            self.vars[field].trace_add("write", self.check)
+        self.problem_var = tk.StringVar()
+        ttk.Label(self.frame, textvariable=self.problem_var, foreground="red").grid(row=3, column=1, columnspan=2, sticky=tk.W)
+
+    def bind_to(self, roster, index, rejected=None):
+        self.index = index
+        name = self.name = roster.names[index]
+        self.vars["name"].set(name)
+        self.vars["level"].set(str(roster.levels[index]))
+        self.vars["health"].set(str(roster.healths[index]))
+        # Edits that couldn't be stored stay on screen until they're fixed
+        for field, (text, problem) in (rejected or {}).items():
+            self.vars[field].set(text)
+        # Placeholder now, the sprite is swapped in once it has been decoded
+        self.show_image(name, self.get_image(name, lambda image: self.show_image(name, image)))
+
+    def show_image(self, name, image):
+        if name != self.name:
+            return  # Row was rebound to another Dynamon meanwhile
+        self.image_label.configure(image=image)
+        self.image_label.image = image  # Keep a reference
+
+    def problems(self):
+        problems = dict(self.validate(*(self.vars[field].get() for field in ("name", "level", "health"))))
+        for field in ("level", "health"):
+            try:
+                int(self.vars[field].get())
+            except ValueError:
+                problems.setdefault(field, f"{field.capitalize()} must be a whole number")
+        return problems
+
+    def check(self, *args):
+        problems = self.problems() if self.index is not None else {}
+        self.problem_var.set("; ".join(problems.values()))
+
+    def store(self, roster):
+        """ Write the edited values back, except those that fail validation
+
+        Returns the changes as [(field, index, old, new)] and the rejected
+        values as {field: (text, problem)}. Only edited fields can be
+        rejected: a value that was already in the save is shown with its
+        problem as a warning but never blocks saving.
+        """
+        if self.index is None or self.index >= len(roster):
+            return [], {}
+        problems = self.problems()
+        changes = []
+        rejected = {}
+        for field in ("name", "level", "health"):
+            value = self.vars[field].get()
+            if value == str(roster.columns[field][self.index]):
+                continue  # Untouched
+            if field in problems:
+                rejected[field] = (value, problems[field])
+                continue
+            if field != "name":
+                value = int(value)
+            column = roster.columns[field]
+            if column[self.index] != value:
+                changes.append((field, self.index, column[self.index], value))
+                column[self.index] = value
+        return changes, rejected
+
+
+class RosterView(ttk.Frame):
+    """ Scrollable roster list that only creates widgets for the visible rows """
+
+    def __init__(self, parent, get_image, prefetch=None, row_height=ROW_HEIGHT, validate=None, on_edit=None):
+        super().__init__(parent)
+        self.get_image = get_image
+        self.prefetch = prefetch
+        self.on_edit = on_edit  # Called with [(field, index, old, new)] whenever edits are stored
+        self.validate = validate  # (name, level, health) -> {field: problem}, may be set later
+        self.row_height = row_height
+        self.roster = Roster()
+        self.rejected = {}  # index -> {field: (text, problem)} for edits that failed validation
+        self.first = 0
+        self.rows = []
+
+        self.body = ttk.Frame(self)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.body.pack(side="left", fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.body.bind("<Configure>", self.on_resize)
+        self.bind_wheel(self.body)
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self.scroll(-1))
+        widget.bind("<Button-5>", lambda e: self.scroll(1))
+        for child in widget.winfo_children():
+            self.bind_wheel(child)
+
+    def visible_count(self):
+        return max(1, self.body.winfo_height() // self.row_height)
+
+    def on_resize(self, event):
+        # Keep just enough rows in the pool to cover the viewport
+        needed = event.height // self.row_height + 1
+        while len(self.rows) < needed:
+            row = RosterRow(self.body, self.get_image, self.check, self.commit)
+            self.bind_wheel(row.frame)
+            self.rows.append(row)
+        self.refresh()
+
+    def check(self, name, level, health):
+        return self.validate(name, level, health) if self.validate is not None else {}
+
+    def set_validator(self, validate):
+        self.validate = validate
+        for row in self.rows:
+            row.check()
+
+    def set_roster(self, roster):
+        for row in self.rows:
+            row.index = row.name = None
+        self.roster = roster
+        self.rejected = {}
+        self.first = 0
+        self.refresh()
+
+    def replace_roster(self, roster):
+        """ Swap in an updated roster, rebinding only the visible rows whose Dynamon changed """
+        old = self.roster
+        self.roster = roster
+        self.rejected = {index: fields for index, fields in self.rejected.items() if index < len(roster)}
+        for row in self.rows:
+            index = row.index
+            if index is not None and (index >= len(old) or index >= len(roster) or old[index] != roster[index]):
+                row.index = row.name = None
+        self.first = min(self.first, self.max_first())
+        self.refresh()
+
+    def commit(self):
+        """ Push any edits in the on-screen rows into the roster """
+        changes = []
+        for row in self.rows:
+            if row.index is None:
+                continue
+            stored, rejected = row.store(self.roster)
+            changes += stored
+            if rejected:
+                self.rejected[row.index] = rejected
+            else:
+                self.rejected.pop(row.index, None)
+        if changes and self.on_edit is not None:
+            self.on_edit(changes)
+
+    def rejected_edits(self):
+        """ [(index, name, [problem, ...])] for the edits that couldn't be stored """
+        return [(index, self.roster.names[index], [problem for _, problem in fields.values()])
+                for index, fields in sorted(self.rejected.items())]
+
+    def reload(self):
+        """ Show the roster's values again after it was changed elsewhere, keeping the scroll position """
+        for row in self.rows:
+            row.index = row.name = None
+        self.first = min(self.first, self.max_first())
+        self.refresh()
+
+    def max_first(self):
+        return max(0, len(self.roster) - self.visible_count())
+
+    def scroll(self, amount):
+        self.scroll_to(self.first + amount)
+
+    def scroll_to(self, first):
+        first = min(max(0, first), self.max_first())
+        if first != self.first:
+            self.commit()
+            self.first = first
+            self.refresh()
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.roster)))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self.visible_count()
+            self.scroll(amount)
+
+    @profiler.timed("roster_refresh")
+    def refresh(self):
+        total = len(self.roster)
+        for offset, row in enumerate(self.rows):
+            index = self.first + offset
+            if index < total:
+                if row.index != index:
+                    row.bind_to(self.roster, index, self.rejected.get(index))
+                row.frame.place(x=0, y=offset * self.row_height, relwidth=1, height=self.row_height - 4)
+            else:
+                row.index = row.name = None
+                row.frame.place_forget()
+
+        if self.prefetch is not None and self.rows:
+            # Warm the sprites one screen above and below the viewport
+            page = len(self.rows)
+            names = self.roster.names
+            self.prefetch(names[self.first + page:self.first + 2 * page] + names[max(0, self.first - page):self.first])
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible_count()) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
@@ -0,0 +1,182 @@
+""" Typed parsers and serializers for the packed strings inside a save
+
+Every codec round-trips well-formed values exactly: encode(decode(text))
+gives back text byte for byte, including leading or trailing separators.
+"""
+import json
+
+KEY_PREFIX = "dynamons_world"
+
+
+class TextCodec:
+    """ Plain string, the fallback for keys without a registered codec """
+
+    def decode(self, text):
+        return text
+
+    def encode(self, value):
+        return value
+
+
+class ListCodec:
+    """ separator-joined strings, "" is the empty list """
+
+    def __init__(self, separator=","):
+        self.separator = separator
+
+    def decode(self, text):
+        return text.split(self.separator) if text else []
+
+    def encode(self, value):
+        return self.separator.join(value)
+
+
+class ItemCounts(dict):
+    """ item name -> count, remembering whether the string ended with ; """
+
+    trailing_separator = False
+
+
+class ItemsCodec:
+    """ dynamons_worldITEMS_DATA: name,count;name,count """
+
+    def decode(self, text):
+        items = ItemCounts()
+        items.trailing_separator = text.endswith(";")
+        for record in text.split(";"):
+            if record:
+                name, _, count = record.rpartition(",")
+                try:
+                    number = int(count)
+                except ValueError:
+                    number = None
+                # Counts that wouldn't print back the same stay strings
+                items[name] = number if str(number) == count else count
+        return items
+
+    def encode(self, value):
+        text = ";".join(f"{name},{count}" for name, count in value.items())
+        return text + ";" if getattr(value, "trailing_separator", False) else text
+
+
+class TaggedListCodec:
+    """ dynamons_worldSKILL_UNLOCK_WATCH_NUMBER: skill#ice_breath#1,skill#dark_blast#1
+
+    Decodes to a list of field lists, e.g. [["skill", "ice_breath", "1"], ...].
+    """
+
+    def __init__(self, separator=",", field_separator="#"):
+        self.separator = separator
+        self.field_separator = field_separator
+
+    def decode(self, text):
+        return [entry.split(self.field_separator) for entry in text.split(self.separator)] if text else []
+
+    def encode(self, value):
+        return self.separator.join(self.field_separator.join(fields) for fields in value)
+
+
+class JSONCodec:
+    """ JSON blobs written compactly like the game does, "" is None """
+
+    def decode(self, text):
+        return json.loads(text) if text else None
+
+    def encode(self, value):
+        if value is None:
+            return ""
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+class RosterCodec:
+    """ dynamons_worldMONS_DATA as a column-wise Roster """
+
+    def decode(self, text):
+        from roster import Roster
+        return Roster.parse(text)
+
+    def encode(self, value):
+        return value.serialize()
+
+
+TEXT = TextCodec()
+COMMA_LIST = ListCodec(",")
+SEMICOLON_LIST = ListCodec(";")
+JSON = JSONCodec()
+
+# Keys without the dynamons_world prefix
+CODECS = {
+    "MONS_DATA": RosterCodec(),
+    "ITEMS_DATA": ItemsCodec(),
+    "SKILL_UNLOCK_WATCH_NUMBER": TaggedListCodec(),
+    "CAPTURED_MONS": SEMICOLON_LIST,
+    "MAPS_UNLOCKED": COMMA_LIST,
+    "MAP_PACKS_UNLOCKED": COMMA_LIST,
+    "NODES_BEATED": COMMA_LIST,
+    "COMPLETED_IDS": COMMA_LIST,
+    "COMPLETED_IDS_EVENT": COMMA_LIST,
+    "SEEN_DIALOGS": COMMA_LIST,
+    "AVATARS_BOUGHT": COMMA_LIST,
+    "BOUGHT_IAPS": COMMA_LIST,
+    "SCAVENGE_DATA": JSON,
+    "RELATIVE_MAPS_DATA": JSON,
+    "PVP_SEASONS": JSON,
+    "PVP_MATCHES_HISTORY": JSON,
+    "DAILY_MISSIONS": JSON,
+    "USING_MONS": JSON,
+    "BATTLE_COUNTER": JSON,
+}
+
+
+def register(key, codec):
+    CODECS[key[len(KEY_PREFIX):] if key.startswith(KEY_PREFIX) else key] = codec
+
+
+def codec_for(key):
+    return CODECS.get(key[len(KEY_PREFIX):] if key.startswith(KEY_PREFIX) else key, TEXT)
+
+
+class SaveFields:
+    """ Decoded values of a SaveDocument, keyed like the document
+
+    A value is only decoded the first time it's read and only re-encoded
+    when it's assigned back (or passed to mark_modified after an in-place
+    edit), so untouched entries keep their original text.
+    """
+
+    def __init__(self, document):
+        self.document = document
+        self.values = {}
+        self.modified = set()
+
+    def __contains__(self, key):
+        return key in self.document
+
+    def __getitem__(self, key):
+        if key not in self.values:
+            if key not in self.document:
+                raise KeyError(key)
+            text = self.document.get(key)
+            try:
+                self.values[key] = codec_for(key).decode(text)
+            except ValueError as e:
+                raise ValueError(f"Can't decode {key}: {e}") from e
+        return self.values[key]
+
+    def __setitem__(self, key, value):
+        if key not in self.document:
+            raise KeyError(key)
+        self.values[key] = value
+        self.modified.add(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self.document else default
+
+    def mark_modified(self, key):
+        self.modified.add(key)
+
+    def flush(self):
+        """ Encode the modified values back into the document """
+        for key in self.modified:
+            self.document.set(key, codec_for(key).encode(self.values[key]))
+        self.modified.clear()
@@ -0,0 +1,183 @@
+""" Keyed diff between two saves, descending into packed values
+
+    python save_diff.py old.xml new.xml
+    python save_diff.py MainActivity.xml --backups save_backups
+
+Entries are aligned by name. Values with equal hashes and text are skipped
+without decoding; changed ones are decoded through save_codecs, so
+MONS_DATA is compared per Dynamon (matched by its id column) and JSON blobs
+per path.
+"""
+from collections import namedtuple
+from pathlib import Path
+import argparse
+import json
+import sys
+from save_document import SaveDocument
+from save_codecs import codec_for
+from roster import Roster, FIELDS
+
+Change = namedtuple("Change", "kind path old new")  # kind: added, removed or changed
+
+
+def diff_values(old, new, path, changes):
+    if isinstance(old, Roster) and isinstance(new, Roster):
+        diff_rosters(old, new, path, changes)
+    elif isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                changes.append(Change("removed", path + (key,), old[key], None))
+            elif old[key] != new[key]:
+                diff_values(old[key], new[key], path + (key,), changes)
+        for key in new:
+            if key not in old:
+                changes.append(Change("added", path + (key,), None, new[key]))
+    elif isinstance(old, list) and isinstance(new, list):
+        if all(isinstance(item, str) for item in old) and all(isinstance(item, str) for item in new):
+            # ID lists like MAPS_UNLOCKED, compared as sets
+            old_items, new_items = set(old), set(new)
+            changes.extend(Change("removed", path, item, None) for item in old if item not in new_items)
+            changes.extend(Change("added", path, None, item) for item in new if item not in old_items)
+            return
+        for i in range(max(len(old), len(new))):
+            if i >= len(new):
+                changes.append(Change("removed", path + (i,), old[i], None))
+            elif i >= len(old):
+                changes.append(Change("added", path + (i,), None, new[i]))
+            elif old[i] != new[i]:
+                diff_values(old[i], new[i], path + (i,), changes)
+    elif old != new or type(old) is not type(new):
+        changes.append(Change("changed", path, old, new))
+
+
+def roster_keys(roster):
+    """ One key per Dynamon: its id (value2) when those are unique, else its position """
+    ids = list(roster.columns["value2"])
+    return ids if len(set(ids)) == len(ids) else list(range(len(roster)))
+
+
+def diff_rosters(old, new, path, changes):
+    old_keys, new_keys = roster_keys(old), roster_keys(new)
+    old_at = {key: i for i, key in enumerate(old_keys)}
+    new_at = {key: i for i, key in enumerate(new_keys)}
+    for key, i in old_at.items():
+        j = new_at.get(key)
+        if j is None:
+            changes.append(Change("removed", path + (key,), old[i], None))
+            continue
+        for field in FIELDS:
+            if old.columns[field][i] != new.columns[field][j]:
+                changes.append(Change("changed", path + (key, field), old.columns[field][i], new.columns[field][j]))
+        if old.tails[i] != new.tails[j]:
+            changes.append(Change("changed", path + (key, "tail"), old.tails[i], new.tails[j]))
+    for key, j in new_at.items():
+        if key not in old_at:
+            changes.append(Change("added", path + (key,), None, new[j]))
+
+
+def changed_entries(old, new):
+    """ Names of the entries added, removed or changed between two SaveDocuments """
+    names = [name for name in old.keys() if name not in new or not same_text(old.get(name), new.get(name))]
+    return names + [name for name in new.keys() if name not in old]
+
+
+def same_text(a, b):
+    return hash(a) == hash(b) and a == b
+
+
+def diff_documents(old, new):
+    """ Changes between two SaveDocuments, paths start with the entry name """
+    changes = []
+    for name in old.keys():
+        if name not in new:
+            changes.append(Change("removed", (name,), old.get(name), None))
+            continue
+        old_text, new_text = old.get(name), new.get(name)
+        if same_text(old_text, new_text):
+            continue
+        codec = codec_for(name)
+        try:
+            old_value, new_value = codec.decode(old_text), codec.decode(new_text)
+        except ValueError:
+            old_value, new_value = old_text, new_text
+        before = len(changes)
+        diff_values(old_value, new_value, (name,), changes)
+        if len(changes) == before:
+            # Same decoded value, only the spelling differs
+            changes.append(Change("changed", (name,), old_text, new_text))
+    for name in new.keys():
+        if name not in old:
+            changes.append(Change("added", (name,), None, new.get(name)))
+    return changes
+
+
+def diff_files(old_path, new_path):
+    return diff_documents(SaveDocument.load(old_path), SaveDocument.load(new_path))
+
+
+def diff_backups(save_path, backup_dir=Path("save_backups")):
+    """ {label: changes} of every backup of save_path against its current content
+
+    Covers the snapshot store and any legacy .bak files of the same save.
+    The current save is parsed once for the whole batch.
+    """
+    from backups import BackupStore
+    current = SaveDocument.load(save_path)
+    results = {}
+    store = BackupStore(backup_dir)
+    entries = store.history(save_path)
+    for entry in reversed(entries):
+        old = SaveDocument.from_bytes(store.read(save_path, entry, entries))
+        # Saves within the same second share a time, the hash keeps the labels apart
+        results[f"snapshot {entry['time']} {entry['hash'][:8]}"] = diff_documents(old, current)
+    for bak in sorted(Path(backup_dir).glob(f"{Path(save_path).stem}_*.bak"), reverse=True):
+        results[bak.name] = diff_documents(SaveDocument.load(bak), current)
+    return results
+
+
+def format_value(value, limit=80):
+    if isinstance(value, Roster):
+        value = f"<{len(value)} Dynamons>"
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def format_path(path):
+    return path[0] + "".join(f"[{key!r}]" for key in path[1:])
+
+
+def format_changes(changes):
+    lines = []
+    for change in changes:
+        if change.kind == "changed":
+            lines.append(f"~ {format_path(change.path)}: {format_value(change.old)} -> {format_value(change.new)}")
+        elif change.kind == "added":
+            lines.append(f"+ {format_path(change.path)}: {format_value(change.new)}")
+        else:
+            lines.append(f"- {format_path(change.path)}: {format_value(change.old)}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare Dynamons World saves")
+    parser.add_argument("old", type=Path, help="save (or backup) to compare from")
+    parser.add_argument("new", type=Path, nargs="?", help="save to compare to")
+    parser.add_argument("--backups", type=Path, metavar="DIR",
+                        help="compare every backup of OLD in DIR against OLD instead")
+    args = parser.parse_args(argv)
+
+    if args.backups:
+        for label, changes in diff_backups(args.old, args.backups).items():
+            print(f"=== {label}: {len(changes)} changes")
+            if changes:
+                print(format_changes(changes))
+    elif args.new:
+        changes = diff_files(args.old, args.new)
+        print(format_changes(changes) if changes else "No differences")
+    else:
+        parser.error("give a second save or --backups")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, unescape
+import io
+import re
+
+# Tags Android uses for SharedPreferences entries
+VALUE_TAGS = ("string", "int", "long", "float", "boolean")
+
+# Matches one entry in the raw file so its value can be patched in place
+ENTRY_PATTERN = re.compile(
+    rb'<(string|int|long|float|boolean)\s([^>]*?)(/>|>(.*?)</\1\s*>)', re.S)
+NAME_PATTERN = re.compile(rb'\bname="([^"]*)"')
+VALUE_PATTERN = re.compile(rb'\bvalue="([^"]*)"')
+
+
+def find_value_spans(data):
+    """ Map entry name -> (start, end, self_closing) of its value bytes """
+    spans = {}
+    for match in ENTRY_PATTERN.finditer(data):
+        attrs = match.group(2)
+        name_match = NAME_PATTERN.search(attrs)
+        if not name_match:
+            continue
+        name = unescape(name_match.group(1).decode('utf-8'), {"&quot;": '"'})
+        if match.group(1) == b"string":
+            if match.group(3) == b"/>":
+                spans[name] = (match.start(3), match.end(3), True)
+            else:
+                spans[name] = (match.start(4), match.end(4), False)
+        else:
+            value_match = VALUE_PATTERN.search(attrs)
+            if value_match:
+                offset = match.start(2)
+                spans[name] = (offset + value_match.start(1), offset + value_match.end(1), False)
+    return spans
+
+
+class SaveDocument:
+    """ A MainActivity.xml save parsed once and indexed by entry name """
+
+    def __init__(self, tree, raw=None):
+        self.tree = tree
+        self.root = tree.getroot()
+        self.index = {}
+        for element in self.root.iter():
+            if element.tag in VALUE_TAGS:
+                name = element.get("name")
+                if name is not None:
+                    self.index[name] = element
+        # Raw bytes and value offsets let write() splice only dirty entries
+        self.raw = raw
+        self.spans = find_value_spans(raw) if raw is not None else {}
+        self.dirty = set()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(ET.parse(io.BytesIO(data)), data)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def keys(self):
+        return self.index.keys()
+
+    def get(self, name, default=None):
+        element = self.index.get(name)
+        if element is None:
+            return default
+        if element.tag == "string":
+            return element.text or ""
+        return element.get("value", "")
+
+    def set(self, name, value):
+        element = self.index.get(name)
+        if element is None:
+            raise KeyError(name)
+        if self.get(name) == value:
+            return
+        if element.tag == "string":
+            element.text = value
+        else:
+            element.set("value", value)
+        self.dirty.add(name)
+
+    def snapshot(self):
+        """ What write() would write, frozen so it can be rendered on another thread """
+        values = {name: self.get(name) for name in self.dirty}
+        if self.raw is None or not self.dirty.issubset(self.spans):
+            # Layout we can't patch safely, fall back to a full rewrite
+            buffer = io.BytesIO()
+            self.tree.write(buffer, encoding='utf-8', xml_declaration=True)
+            return SaveSnapshot(buffer.getvalue(), [], values)
+        edits = [self.spans[name] + (self.index[name].tag, value) for name, value in values.items()]
+        return SaveSnapshot(self.raw, edits, values)
+
+    def patched_bytes(self):
+        """ Original bytes with only the dirty values replaced """
+        return self.snapshot().render()
+
+    def saved(self, snapshot):
+        """ Take on a written snapshot's bytes, entries edited since it was taken stay dirty """
+        self.raw = snapshot.data
+        self.spans = snapshot.spans
+        self.dirty = {name for name in self.dirty if self.get(name) != snapshot.values.get(name)}
+
+    def write(self, path):
+        snapshot = self.snapshot()
+        snapshot.write(path)
+        self.saved(snapshot)
+
+
+class SaveSnapshot:
+    """ The bytes of a SaveDocument at one point in time, not yet joined together
+
+    Holds the original bytes plus the dirty values as plain strings, none
+    of which later edits to the document can reach, so render() and
+    write() are safe to run on a worker thread.
+    """
+
+    def __init__(self, raw, edits, values):
+        self.raw = raw
+        self.edits = edits  # [(start, end, self_closing, tag, value)]
+        self.values = values  # name -> value of every dirty entry
+        self.data = None
+        self.spans = None
+
+    def render(self):
+        edits = []
+        for start, end, self_closing, tag, value in self.edits:
+            if tag == "string":
+                value = escape(value).encode('utf-8')
+                if self_closing:
+                    value = b">" + value + b"</string>"
+            else:
+                value = escape(value, {'"': "&quot;"}).encode('utf-8')
+            edits.append((start, end, value))
+        if not edits:
+            return self.raw
+        edits.sort()
+
+        view = memoryview(self.raw)
+        chunks = []
+        position = 0
+        for start, end, value in edits:
+            chunks.append(view[position:start])
+            chunks.append(value)
+            position = end
+        chunks.append(view[position:])
+        return b"".join(chunks)
+
+    def write(self, path):
+        from atomic_write import write_atomic
+        self.data = self.render()
+        write_atomic(path, self.data)
+        self.spans = find_value_spans(self.data)
+        return self
@@ -0,0 +1,107 @@
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+import re
+import lazy_json
+from disk_cache import cached_build
+
+INDEX_VERSION = 2
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """ Lowercase words, plus the parts of snake_case words like poison_bite """
+    tokens = set()
+    for word in WORD_PATTERN.findall(str(text).lower()):
+        tokens.add(word)
+        if "_" in word:
+            tokens.update(part for part in word.split("_") if part)
+    return tokens
+
+
+class SearchIndex:
+    """ Inverted index from key/value words to nodes of a JSON document
+
+    Nodes are numbered parents-before-children and stored as a parent-pointer
+    trie (parents[i], keys[i]), so a match's JSON path is rebuilt on demand
+    instead of keeping a tuple per node. Postings for all tokens share one
+    flat array, token i owns postings[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, parents, keys, vocabulary, postings, offsets):
+        self.parents = parents
+        self.keys = keys
+        self.vocabulary = vocabulary  # sorted tokens
+        self.postings = postings  # sorted node ids per token
+        self.offsets = offsets
+
+    @classmethod
+    def build(cls, data):
+        parents = [-1]
+        keys = [None]
+        words = {}
+        stack = [(data, 0)]
+        while stack:
+            value, node = stack.pop()
+            if lazy_json.is_container(value):
+                children = list(lazy_json.children(value, eager_below=1 << 16))
+            else:
+                for token in tokenize(value):
+                    words.setdefault(token, []).append(node)
+                continue
+            # Reversed so the stack pops children in document order
+            for key, child in reversed(children):
+                child_node = len(parents)
+                parents.append(node)
+                keys.append(key)
+                if isinstance(key, str):
+                    for token in tokenize(key):
+                        words.setdefault(token, []).append(child_node)
+                stack.append((child, child_node))
+
+        vocabulary = sorted(words)
+        postings = array('i')
+        offsets = array('i', [0])
+        for token in vocabulary:
+            postings.extend(sorted(set(words[token])))
+            offsets.append(len(postings))
+        return cls(array('i', parents), keys, vocabulary, postings, offsets)
+
+    @classmethod
+    def load_or_build(cls, path, cache_dir=Path("cache")):
+        """ Index of a base64 JSON file, cached on disk by content hash """
+        def build(source):
+            # Walked straight off the decoded buffer, subtrees are decoded one at a time and dropped
+            index = cls.build(lazy_json.load_file(source))
+            return (index.parents.tobytes(), index.keys, index.vocabulary,
+                    index.postings.tobytes(), index.offsets.tobytes())
+
+        parents, keys, vocabulary, postings, offsets = cached_build(path, "search", INDEX_VERSION, build,
+                                                                    cache_dir, suffix=".idx")
+        return cls(array('i', parents), keys, vocabulary, array('i', postings), array('i', offsets))
+
+    def path(self, node):
+        path = []
+        while node > 0:
+            path.append(self.keys[node])
+            node = self.parents[node]
+        return tuple(reversed(path))
+
+    def matching_nodes(self, token):
+        """ Nodes containing a word that starts with token """
+        nodes = set()
+        position = bisect_left(self.vocabulary, token)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(token):
+            nodes.update(self.postings[self.offsets[position]:self.offsets[position + 1]])
+            position += 1
+        return nodes
+
+    def search(self, query, limit=200):
+        """ JSON paths of the nodes matching every word of query """
+        tokens = WORD_PATTERN.findall(query.lower())
+        if not tokens:
+            return []
+        # Rarest words first keeps the intersections small
+        matches = sorted((self.matching_nodes(token) for token in tokens), key=len)
+        nodes = matches[0].intersection(*matches[1:])
+        return [self.path(node) for node in sorted(nodes)[:limit]]
@@ -0,0 +1,124 @@
+""" Pack images/<species>/<variant>.png into one archive with an offset index
+
+    python sprite_pack.py images sprites.pack --scale icon=100x100
+
+Layout: a 24 byte header (magic, version, index offset, index length), the
+PNG entries back to back, then a JSON index mapping "species/variant" to
+[offset, length, width, height]. Scaled variants are re-encoded at that
+size so the editor can skip the resize as well as the file open.
+"""
+from pathlib import Path
+import argparse
+import io
+import json
+import mmap
+import struct
+import sys
+
+MAGIC = b"DSPK"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxQQ")
+
+
+def entry_name(species, variant):
+    return f"{species.lower()}/{variant}"
+
+
+def build(images_dir, output, scale=None):
+    """ Write the archive, scale maps a variant to the (width, height) to store it at """
+    from PIL import Image
+    scale = scale or {}
+    index = {}
+    with open(output, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+        for path in sorted(Path(images_dir).glob("*/*.png")):
+            variant = path.stem
+            if variant in scale:
+                with Image.open(path) as img:
+                    img = img.convert("RGBA").resize(scale[variant])
+                    buffer = io.BytesIO()
+                    img.save(buffer, "PNG", optimize=True)
+                    data = buffer.getvalue()
+                    size = img.size
+            else:
+                data = path.read_bytes()
+                with Image.open(io.BytesIO(data)) as img:
+                    size = img.size
+            index[entry_name(path.parent.name, variant)] = [f.tell(), len(data), *size]
+            f.write(data)
+
+        index_offset = f.tell()
+        index_data = json.dumps(index, separators=(",", ":")).encode('utf-8')
+        f.write(index_data)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, index_offset, len(index_data)))
+    return len(index)
+
+
+class SpriteArchive:
+    """ Read-only, mmap-backed view of a sprite archive
+
+    Only the index is parsed up front, entry bytes are sliced out of the
+    mapping when a sprite is actually decoded. Safe to share between the
+    sprite decoding threads.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_offset, index_length = HEADER.unpack_from(self.data)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} sprite archive")
+            self.index = json.loads(self.data[index_offset:index_offset + index_length])
+        except Exception:
+            self.close()
+            raise
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def size(self, species, variant="icon"):
+        entry = self.index.get(entry_name(species, variant))
+        return tuple(entry[2:]) if entry else None
+
+    def read(self, species, variant="icon"):
+        """ Raw PNG bytes, or None if the archive doesn't have that sprite """
+        entry = self.index.get(entry_name(species, variant))
+        if entry is None:
+            return None
+        offset, length = entry[:2]
+        return self.data[offset:offset + length]
+
+    def open(self, species, variant="icon"):
+        """ PIL image of the entry, or None """
+        from PIL import Image
+        data = self.read(species, variant)
+        return None if data is None else Image.open(io.BytesIO(data))
+
+    def close(self):
+        if getattr(self, "data", None) is not None:
+            self.data.close()
+        self.file.close()
+
+
+def parse_scale(text):
+    variant, _, size = text.partition("=")
+    width, _, height = size.lower().partition("x")
+    return variant, (int(width), int(height))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack the sprite folders into one archive")
+    parser.add_argument("images_dir", type=Path)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--scale", action="append", type=parse_scale, default=[],
+                        metavar="VARIANT=WxH", help="store a variant pre-scaled, e.g. icon=100x100")
+    args = parser.parse_args(argv)
+    count = build(args.images_dir, args.output, dict(args.scale))
+    print(f"Packed {count} sprites into {args.output} ({args.output.stat().st_size // 1024} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
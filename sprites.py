@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import os
+import queue
+from PIL import Image, ImageTk
+from profiling import profiler
+from sprite_pack import entry_name
+
+VARIANTS = ("icon", "front", "back")
+DEFAULT_SIZE = (100, 100)
+
+
+class SpriteCache:
+    """ Decodes each sprite once and keeps a bounded LRU of PhotoImages
+
+    Sprites come from a packed SpriteArchive when one is given, otherwise
+    from images/<species>/<variant>.png. Cached entries are keyed
+    by (species, variant, size). Every missing sprite of a given size shares
+    one placeholder image.
+
+    PIL decoding runs on a small worker pool; finished images come back
+    through a queue that the Tk loop drains with poll(), since PhotoImages
+    may only be created on the Tk thread.
+    """
+
+    def __init__(self, images_dir, capacity=128, workers=2, archive=None):
+        self.images_dir = images_dir
+        self.archive = archive
+        self.capacity = capacity
+        self.images = OrderedDict()
+        self.placeholders = {}
+        self.missing = set()
+        self.pending = {}  # key -> callbacks waiting for the decoded image
+        self.ready = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sprites")
+
+    def sprite_path(self, species, variant="icon"):
+        return os.path.join(self.images_dir, species.lower(), f"{variant}.png")
+
+    @profiler.timed("sprite_decode")
+    def load_image(self, species, variant="icon", size=DEFAULT_SIZE):
+        """ Decoded and scaled PIL image, or None if the sprite is missing """
+        try:
+            if self.archive is not None and entry_name(species, variant) in self.archive:
+                img = self.archive.open(species, variant)
+            else:
+                img = Image.open(self.sprite_path(species, variant))
+            with img:
+                img = img.convert("RGBA")
+        except (OSError, ValueError):
+            return None
+        # Pre-scaled archive entries are already the right size
+        return img if img.size == size else img.resize(size)
+
+    def placeholder(self, size=DEFAULT_SIZE):
+        if size not in self.placeholders:
+            self.placeholders[size] = ImageTk.PhotoImage(Image.new('RGB', size, color='gray'))
+        return self.placeholders[size]
+
+    def cached(self, key):
+        if key in self.images:
+            self.images.move_to_end(key)
+            return self.images[key]
+        if key in self.missing:
+            return self.placeholder(key[2])
+        return None
+
+    def store(self, key, img):
+        if img is None:
+            self.missing.add(key)
+            return self.placeholder(key[2])
+        photo = ImageTk.PhotoImage(img)
+        self.images[key] = photo
+        if len(self.images) > self.capacity:
+            self.images.popitem(last=False)
+        return photo
+
+    def get(self, species, variant="icon", size=DEFAULT_SIZE):
+        """ Decode synchronously on the calling (Tk) thread """
+        key = (species.lower(), variant, size)
+        photo = self.cached(key)
+        if photo is None:
+            photo = self.store(key, self.load_image(*key))
+        return photo
+
+    def request(self, species, variant="icon", size=DEFAULT_SIZE, callback=None):
+        """ Cached image, or the placeholder while the sprite decodes in the background
+
+        callback(photo) runs on the Tk thread once the real image is ready.
+        """
+        key = (species.lower(), variant, size)
+        photo = self.cached(key)
+        if photo is not None:
+            return photo
+
+        waiting = self.pending.get(key)
+        if waiting is None:
+            waiting = self.pending[key] = []
+            self.executor.submit(self.decode, key)
+        if callback is not None:
+            waiting.append(callback)
+        return self.placeholder(size)
+
+    def prefetch(self, names, variant="icon", size=DEFAULT_SIZE):
+        for name in names:
+            self.request(name, variant, size)
+
+    def decode(self, key):
+        # Worker thread: only PIL work here, no Tk calls
+        self.ready.put((key, self.load_image(*key)))
+
+    def poll(self):
+        while True:
+            try:
+                key, img = self.ready.get_nowait()
+            except queue.Empty:
+                break
+            photo = self.store(key, img)
+            for callback in self.pending.pop(key, ()):
+                callback(photo)
+
+    def start_polling(self, widget, interval=30):
+        self.poll()
+        widget.after(interval, self.start_polling, widget, interval)
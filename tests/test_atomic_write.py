@@ -0,0 +1,37 @@
+import os
+import stat
+import pytest
+from atomic_write import UMASK, write_atomic
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="file modes are POSIX")
+
+
+def mode(path):
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+@posix_only
+def test_new_file_gets_the_umask_mode(tmp_path):
+    path = tmp_path / "temp_save.xml"
+    write_atomic(path, b"<map />")
+    assert path.read_bytes() == b"<map />"
+    assert mode(path) == 0o666 & ~UMASK
+
+
+@posix_only
+def test_existing_file_keeps_its_mode(tmp_path):
+    path = tmp_path / "MainActivity.xml"
+    path.write_bytes(b"old")
+    os.chmod(path, 0o640)
+    write_atomic(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert mode(path) == 0o640
+
+
+def test_failed_write_leaves_the_old_file_and_no_temp_file(tmp_path):
+    path = tmp_path / "MainActivity.xml"
+    path.write_bytes(b"old")
+    with pytest.raises(TypeError):
+        write_atomic(path, "not bytes")
+    assert path.read_bytes() == b"old"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["MainActivity.xml"]
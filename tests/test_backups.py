@@ -0,0 +1,93 @@
+import hashlib
+from pathlib import Path
+import pytest
+from backups import BackupStore, apply_delta, make_delta
+from save_document import SaveDocument
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def version(base, n):
+    """ The sample save with a few values changed, different for every n """
+    document = SaveDocument.from_bytes(base)
+    document.set("dynamons_worldPLAYER_COINS", str(1000 + n))
+    if n % 2:
+        document.set("dynamons_worldPLAYER_DUST", str(n))
+    return document.patched_bytes()
+
+
+def check_store(store, save):
+    entries = store.history(save)
+    for entry in entries:
+        content = store.read(save, entry, entries)
+        assert hashlib.sha256(content).hexdigest() == entry["hash"]
+        assert entry["depth"] < store.full_every
+    objects = {path.name for path in (store.save_dir(save) / "objects").iterdir()}
+    assert objects == {entry["object"] for entry in entries}  # Nothing orphaned or missing
+    return entries
+
+
+def test_delta_round_trip():
+    old = (ROOT / "temp_save.xml").read_bytes()
+    new = version(old, 1)
+    assert apply_delta(old, make_delta(old, new)) == new
+    assert apply_delta(new, make_delta(new, b"")) == b""
+
+
+@pytest.mark.parametrize("keep, full_every", [(5, 3), (3, 10), (8, 4)])
+def test_every_entry_rebuilds_after_retention(tmp_path, keep, full_every):
+    base = (ROOT / "temp_save.xml").read_bytes()
+    save = tmp_path / "MainActivity.xml"
+    store = BackupStore(tmp_path / "backups", keep=keep, full_every=full_every)
+
+    for n in range(3 * max(keep, full_every) + 2):
+        save.write_bytes(version(base, n))
+        assert store.snapshot(save) is not None
+        assert store.snapshot(save) is None  # Unchanged content isn't stored again
+        entries = check_store(store, save)
+        assert len(entries) == min(n + 1, keep)
+        assert entries[-1]["hash"] == hashlib.sha256(save.read_bytes()).hexdigest()
+    assert any(entry["base"] is not None for entry in entries)
+    assert entries[0]["base"] is None  # Oldest kept entry was promoted to a full snapshot
+
+
+def test_returning_to_an_earlier_state_reuses_its_object(tmp_path):
+    base = (ROOT / "temp_save.xml").read_bytes()
+    save = tmp_path / "MainActivity.xml"
+    store = BackupStore(tmp_path / "backups", keep=10, full_every=10)
+    for n in (0, 1, 2, 1):
+        save.write_bytes(version(base, n))
+        store.snapshot(save)
+    entries = check_store(store, save)
+    assert entries[-1]["object"] == entries[1]["object"]
+    assert len({entry["object"] for entry in entries}) == 3
+
+
+def test_restore(tmp_path):
+    base = (ROOT / "temp_save.xml").read_bytes()
+    save = tmp_path / "MainActivity.xml"
+    store = BackupStore(tmp_path / "backups")
+    for n in range(4):
+        save.write_bytes(version(base, n))
+        store.snapshot(save)
+    entries = store.history(save)
+    save.write_bytes(b"broken")
+    assert store.restore(save, entries[1]) == entries[1]
+    assert save.read_bytes() == version(base, 1)
+    store.restore(save)
+    assert save.read_bytes() == version(base, 3)
+
+
+def test_diff_backups_lists_every_snapshot(tmp_path):
+    from save_diff import diff_backups
+    base = (ROOT / "temp_save.xml").read_bytes()
+    save = tmp_path / "MainActivity.xml"
+    store = BackupStore(tmp_path / "backups")
+    for n in range(3):  # Within one second, so the snapshots share a time
+        save.write_bytes(version(base, n))
+        store.snapshot(save)
+    results = diff_backups(save, tmp_path / "backups")
+    assert len(results) == 3
+    newest, *older = results.values()
+    assert newest == []  # Same bytes as the save
+    assert all(changes for changes in older)
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+import shutil
+import pytest
+from batch_patch import apply_patch, load_patch, patch_file
+from roster import Roster
+from save_document import SaveDocument
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def write_patch(tmp_path, patch):
+    path = tmp_path / "patch.json"
+    path.write_text(json.dumps(patch))
+    return load_patch(path)
+
+
+def test_values_keep_the_save_spelling(tmp_path):
+    patch = write_patch(tmp_path, {"values": {"dynamons_worldFIRST_RUN": True, "dynamons_worldIS_BUYER": False,
+                                              "dynamons_worldPLAYER_COINS": 999999}})
+    document = SaveDocument.load(ROOT / "temp_save.xml")
+    changed = apply_patch(document, patch)
+    assert document.get("dynamons_worldFIRST_RUN") == "true"
+    assert document.get("dynamons_worldIS_BUYER") == "false"
+    assert document.get("dynamons_worldPLAYER_COINS") == "999999"
+    assert "dynamons_worldFIRST_RUN" in changed
+
+
+@pytest.mark.parametrize("patch, message", [
+    ({"value": {}}, "Unknown patch sections"),
+    ({"values": {"dynamons_worldFIRST_RUN": None}}, "strings, numbers or booleans"),
+    ({"values": {"dynamons_worldUSING_MONS": [1, 2]}}, "strings, numbers or booleans"),
+    ({"mons": [{"where": {"max_lvl": 50}, "set": {"level": 75}}]}, "max_lvl"),
+    ({"mons": [{"set": {"lvl": 75}}]}, "Unknown Dynamon fields"),
+])
+def test_bad_patches_are_rejected_up_front(tmp_path, patch, message):
+    with pytest.raises(ValueError, match=message):
+        write_patch(tmp_path, patch)
+
+
+def test_mons_and_items(tmp_path):
+    patch = write_patch(tmp_path, {
+        "items": {"heal_spray": 9999},
+        "mons": [{"where": {"max_level": 20}, "set": {"level": 30, "health": 100}}],
+    })
+    document = SaveDocument.load(ROOT / "temp_save.xml")
+    before = Roster.parse(document.get("dynamons_worldMONS_DATA"))
+    low = before.select(max_level=20)
+    assert low  # The sample has a few low-level Dynamons
+
+    changed = apply_patch(document, patch)
+    assert changed == ["dynamons_worldITEMS_DATA", "dynamons_worldMONS_DATA"]
+    after = Roster.parse(document.get("dynamons_worldMONS_DATA"))
+    assert [after.levels[i] for i in low] == [30] * len(low)
+    assert [after.healths[i] for i in low] == [100] * len(low)
+    untouched = [i for i in range(len(before)) if i not in low]
+    assert [after[i] for i in untouched] == [before[i] for i in untouched]
+    assert "heal_spray,9999;" in document.get("dynamons_worldITEMS_DATA")
+
+
+def test_patch_file(tmp_path):
+    save = tmp_path / "MainActivity.xml"
+    shutil.copyfile(ROOT / "temp_save.xml", save)
+    original = save.read_bytes()
+    patch = write_patch(tmp_path, {"values": {"dynamons_worldPLAYER_COINS": "123"}})
+
+    result = patch_file(save, patch, dry_run=True)
+    assert result["ok"] and result["changed"] == ["dynamons_worldPLAYER_COINS"]
+    assert save.read_bytes() == original
+
+    result = patch_file(save, patch, backup_dir=tmp_path / "backups")
+    assert result["ok"]
+    assert SaveDocument.load(save).get("dynamons_worldPLAYER_COINS") == "123"
+    assert (tmp_path / "backups").exists()
+
+    result = patch_file(tmp_path / "missing.xml", patch)
+    assert not result["ok"] and result["error"].startswith("FileNotFoundError")
@@ -0,0 +1,98 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+import urllib.error
+import pytest
+from downloader import CachedDownload, DownloadCancelled, DownloadTask, CHUNK_SIZE
+
+BODY = b"<?xml version='1.0' encoding='utf-8'?><map><int name=\"n\" value=\"1\" /></map>" * 2000
+ETAG = '"v1"'
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/save.xml":
+            if self.headers.get("If-None-Match") == ETAG:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(BODY)))
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            self.wfile.write(BODY)
+        elif self.path == "/slow.xml":
+            self.send_response(200)
+            self.send_header("Content-Length", str(CHUNK_SIZE * 100))
+            self.end_headers()
+            try:
+                for _ in range(100):
+                    self.wfile.write(b"x" * CHUNK_SIZE)
+                    self.wfile.flush()
+                    time.sleep(0.01)
+            except OSError:
+                pass  # Client went away after cancelling
+        else:
+            self.send_error(404)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_first_fetch_then_304_from_cache(server, tmp_path):
+    progress = []
+    body, from_cache = CachedDownload(url(server, "/save.xml"), tmp_path).fetch(
+        lambda received, total: progress.append((received, total)))
+    assert (body, from_cache) == (BODY, False)
+    assert progress[-1] == (len(BODY), len(BODY))
+
+    body, from_cache = CachedDownload(url(server, "/save.xml"), tmp_path).fetch()
+    assert (body, from_cache) == (BODY, True)
+    assert server.requests == [("/save.xml", None), ("/save.xml", ETAG)]
+
+
+def test_cancel_mid_download(server, tmp_path):
+    cancelled = threading.Event()
+
+    def progress(received, total):
+        if received >= 3 * CHUNK_SIZE:
+            cancelled.set()
+
+    with pytest.raises(DownloadCancelled):
+        CachedDownload(url(server, "/slow.xml"), tmp_path).fetch(progress, cancelled)
+
+
+def test_task_reports_cancellation(server, tmp_path):
+    task = DownloadTask(url(server, "/slow.xml"), tmp_path)
+    task.start()
+    task.cancel()
+    task.thread.join(timeout=10)
+    assert [event[0] for event in task.events()][-1] == "cancelled"
+
+
+def test_http_error(server, tmp_path):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        CachedDownload(url(server, "/missing.xml"), tmp_path).fetch()
+    assert error.value.code == 404
+
+    task = DownloadTask(url(server, "/missing.xml"), tmp_path)
+    task.start()
+    task.thread.join(timeout=10)
+    kind, exception = list(task.events())[-1]
+    assert kind == "error" and exception.code == 404
@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import pytest
+from file_watcher import FileWatcher
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def bump_mtime(path):
+    # Some filesystems keep coarse mtimes, make sure the signature moves
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def save(tmp_path):
+    path = tmp_path / "MainActivity.xml"
+    path.write_bytes(b"<map>1</map>")
+    return path
+
+
+def test_same_bytes_rewritten_is_not_a_change(save):
+    watcher = FileWatcher(save)
+    save.write_bytes(b"<map>1</map>")
+    bump_mtime(save)
+    watcher.check()
+    assert not watcher.pending()
+
+
+def test_new_content_is_pending_exactly_once(save):
+    watcher = FileWatcher(save)
+    save.write_bytes(b"<map>2</map>")
+    bump_mtime(save)
+    watcher.check()
+    assert watcher.pending()
+    assert not watcher.pending()
+    watcher.check()  # Nothing moved since
+    assert not watcher.pending()
+
+
+def test_missing_file_is_not_a_change(save):
+    watcher = FileWatcher(save)
+    save.unlink()
+    watcher.check(force=True)
+    assert not watcher.pending()
+
+
+def test_polling_backend(save, monkeypatch):
+    monkeypatch.setattr(FileWatcher, "open_inotify", lambda self: None)
+    watcher = FileWatcher(save, interval=0.02).start()
+    try:
+        assert watcher.backend == "polling"
+        save.write_bytes(b"<map>changed</map>")
+        bump_mtime(save)
+        assert wait_for(watcher.pending)
+        assert not watcher.pending()
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+def test_inotify_sees_a_file_replaced_by_rename(save):
+    watcher = FileWatcher(save, interval=0.05).start()
+    try:
+        if watcher.backend != "inotify":
+            pytest.skip("inotify isn't available here")
+        incoming = save.with_name("incoming.xml")
+        (save.parent / "other.xml").write_bytes(b"unrelated")
+        incoming.write_bytes(b"<map>pushed</map>")
+        os.replace(incoming, save)
+        assert wait_for(watcher.pending)
+        assert not watcher.pending()
+
+        incoming.write_bytes(b"<map>pushed</map>")  # Same bytes again
+        os.replace(incoming, save)
+        assert not wait_for(watcher.pending, timeout=0.3)
+    finally:
+        watcher.stop()
@@ -0,0 +1,45 @@
+from pathlib import Path
+import pytest
+from game_data import GameData, version_key
+
+ROOT = Path(__file__).resolve().parent.parent
+MIN_VERSIONS = [(20, ""), (25, "1.6.26"), (30, "1.6.32"), (70, "1.11.06"), (75, "1.11.38")]
+
+
+def game_data():
+    return GameData(75, 100, frozenset({"tailton", "duckron"}), MIN_VERSIONS)
+
+
+def test_version_key():
+    assert version_key("1.11.06") == (1, 11, 6)
+    assert version_key("1.11.06") > version_key("1.9.62")
+    assert version_key(None) == ()
+
+
+@pytest.mark.parametrize("game_version, cap", [
+    (None, 75), ("", 75),
+    ("1.6.0", 20),  # Older than every versioned step
+    ("1.6.26", 25), ("1.6.31", 25), ("1.6.32", 30),
+    ("1.10.99", 30), ("1.11.06", 70), ("1.11.38", 75), ("2.0", 75),
+])
+def test_level_cap(game_version, cap):
+    assert game_data().level_cap(game_version) == cap
+
+
+def test_level_caps_keeps_owned_species_and_drops_unknown_ones():
+    caps = game_data().level_caps(["tailton", "mystery", "tailton", "duckron"], "1.6.26")
+    assert caps == {"tailton": 25, "duckron": 25}
+
+
+def test_validate():
+    data = game_data()
+    assert data.validate("tailton", "75", "100") == {}
+    assert set(data.validate("mystery", "76", "-1")) == {"name", "level", "health"}
+    assert data.validate("tailton", "x", "1")["level"] == "Level must be a whole number"
+
+
+def test_build_from_gameplay_dat_and_cache(tmp_path):
+    built = GameData.load_or_build(ROOT / "gameplay.dat", tmp_path)
+    cached = GameData.load_or_build(ROOT / "gameplay.dat", tmp_path)
+    assert built.fields() == cached.fields()
+    assert built.max_level == 75 and "tailton" in built
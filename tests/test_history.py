@@ -0,0 +1,93 @@
+from array import array
+from history import History, column_delta
+
+
+def recorder():
+    """ A dict edited through History, and an apply that writes into it """
+    data = {}
+
+    def apply(key, value):
+        data[key] = value
+    return data, apply
+
+
+def edit(history, data, apply, label, **values):
+    changes = [(apply, key, data.get(key), value) for key, value in values.items()]
+    for _, key, _, value in changes:
+        data[key] = value
+    history.record(label, changes)
+
+
+def test_undo_and_redo_in_order():
+    history = History()
+    data, apply = recorder()
+    edit(history, data, apply, "first", coins=1)
+    edit(history, data, apply, "second", coins=2, dust=5)
+    assert history.undo().label == "second"
+    assert data == {"coins": 1, "dust": None}
+    assert history.undo().label == "first"
+    assert data == {"coins": None, "dust": None}
+    assert history.undo() is None
+    assert history.redo().label == "first"
+    assert history.redo().label == "second"
+    assert data == {"coins": 2, "dust": 5}
+    assert history.redo() is None
+
+
+def test_changes_of_one_edit_are_undone_in_reverse():
+    history = History()
+    data, apply = recorder()
+    data["coins"] = 0
+    history.record("twice", [(apply, "coins", 0, 1), (apply, "coins", 1, 2)])
+    data["coins"] = 2
+    history.undo()
+    assert data["coins"] == 0
+
+
+def test_a_new_edit_clears_redo():
+    history = History()
+    data, apply = recorder()
+    edit(history, data, apply, "first", coins=1)
+    history.undo()
+    edit(history, data, apply, "other", coins=3)
+    assert history.redo() is None
+    assert history.undo().label == "other"
+
+
+def test_empty_edits_are_not_recorded():
+    history = History()
+    history.record("nothing", [])
+    assert not history
+
+
+def test_limit_drops_the_oldest_edits():
+    history = History(limit=3)
+    data, apply = recorder()
+    for n in range(5):
+        edit(history, data, apply, f"edit {n}", coins=n)
+    labels = []
+    while (undone := history.undo()) is not None:
+        labels.append(undone.label)
+    assert labels == ["edit 4", "edit 3", "edit 2"]
+    assert data["coins"] == 1  # Edits 0 and 1 can't be undone any more
+
+
+def test_clear():
+    history = History()
+    data, apply = recorder()
+    edit(history, data, apply, "first", coins=1)
+    history.undo()
+    history.clear()
+    assert not history
+
+
+def test_column_delta_of_arrays():
+    indices, old, new = column_delta(array('q', [1, 2, 3, 4]), array('q', [1, 5, 3, 6]))
+    assert indices == array('q', [1, 3])
+    assert old == array('q', [2, 4]) and new == array('q', [5, 6])
+
+
+def test_column_delta_of_lists():
+    indices, old, new = column_delta(["a", "b", "c"], ["a", "x", "c"])
+    assert list(indices) == [1] and old == ["b"] and new == ["x"]
+    assert len(column_delta(["a"], ["a"])[0]) == 0
@@ -0,0 +1,101 @@
+import base64
+import json
+from pathlib import Path
+import pytest
+import lazy_json
+
+ROOT = Path(__file__).resolve().parent.parent
+TRICKY = {
+    "quote": 'say "hi" ]}',
+    "brackets": "[{,}]",
+    "backslash\\": "ends with \\",
+    "nested": {"list": ["]", "\"", {"k": "{"}], "empty_object": {}, "empty_array": []},
+    "unicode": "dynämon",
+}
+
+
+def write_base64(tmp_path, value, wrap=None, name="data.dat"):
+    encoded = base64.b64encode(json.dumps(value, indent=1).encode('utf-8') if not isinstance(value, bytes) else value)
+    if wrap:
+        encoded = b"\n".join(encoded[i:i + wrap] for i in range(0, len(encoded), wrap)) + b"\n"
+    path = tmp_path / name
+    path.write_bytes(encoded)
+    return path
+
+
+def test_unmodified_gameplay_dat_dumps_to_its_source_bytes():
+    path = ROOT / "gameplay.dat"
+    source = base64.b64decode(path.read_bytes()).strip()
+    data = lazy_json.load_file(path)
+    data["monGenData"]["maxMonLevel"]  # Decoding parts of it doesn't make it dirty
+    assert lazy_json.dumps(data) == source
+
+
+def test_strings_with_quotes_and_brackets(tmp_path):
+    data = lazy_json.load_file(write_base64(tmp_path, TRICKY))
+    assert sorted(data) == sorted(TRICKY)
+    assert data["quote"] == TRICKY["quote"]
+    assert data["nested"]["list"][2]["k"] == "{"
+    assert json.loads(lazy_json.dumps(data)) == TRICKY
+
+    data["nested"]["list"][0] = "changed ["
+    expected = json.loads(json.dumps(TRICKY))
+    expected["nested"]["list"][0] = "changed ["
+    assert json.loads(lazy_json.dumps(data)) == expected
+    assert json.loads(lazy_json.dumps(data, indent=4)) == expected
+
+
+def test_empty_containers(tmp_path):
+    value = {"o": {}, "a": [], "n": [[], {}, [[]]]}
+    data = lazy_json.load_file(write_base64(tmp_path, value))
+    assert len(data["o"]) == 0 and len(data["a"]) == 0
+    assert len(data["n"]) == 3 and len(data["n"][2][0]) == 0
+    data["a"].append(1)
+    data["o"]["k"] = []
+    assert json.loads(lazy_json.dumps(data)) == {"o": {"k": []}, "a": [1], "n": [[], {}, [[]]]}
+
+
+@pytest.mark.parametrize("value", [[1, "two", {"three": [3]}], [], 42, "text", None, True])
+def test_top_level_arrays_and_scalars(tmp_path, value):
+    data = lazy_json.load_file(write_base64(tmp_path, value))
+    assert json.loads(lazy_json.dumps(data)) == value
+    if isinstance(value, list) and value:
+        assert lazy_json.is_array(data)
+        data[0] = 0
+        assert json.loads(lazy_json.dumps(data)) == [0] + value[1:]
+
+
+def test_edits_after_snapshot_stay_out_of_it(tmp_path):
+    data = lazy_json.load_file(write_base64(tmp_path, TRICKY))
+    data["nested"]["list"][1] = "in snapshot"
+    snapshot = lazy_json.snapshot(data)
+    data["nested"]["list"][1] = "after"
+    data["quote"] = "after"
+    data["nested"]["empty_array"].append("after")
+    data["new"] = "after"
+
+    expected = json.loads(json.dumps(TRICKY))
+    expected["nested"]["list"][1] = "in snapshot"
+    assert json.loads(lazy_json.dumps(snapshot)) == expected
+    assert json.loads(lazy_json.dumps(snapshot, indent=2)) == expected
+
+
+def test_snapshot_of_clean_tree_is_a_raw_span(tmp_path):
+    data = lazy_json.load_file(write_base64(tmp_path, TRICKY))
+    snapshot = lazy_json.snapshot(data)
+    assert isinstance(snapshot, lazy_json.Raw)
+    assert lazy_json.dumps(snapshot) == lazy_json.dumps(data)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 5, 7, 64, 77, 1 << 20])
+def test_base64_lines_straddling_chunks(tmp_path, chunk_size):
+    payload = bytes(range(256)) * 5
+    path = write_base64(tmp_path, payload, wrap=76)
+    assert bytes(lazy_json.decode_base64_file(path, chunk_size=chunk_size)) == payload
+
+
+def test_truncated_base64(tmp_path):
+    path = tmp_path / "bad.dat"
+    path.write_bytes(b"QUJD\nRA")
+    with pytest.raises(ValueError):
+        lazy_json.decode_base64_file(path, chunk_size=3)
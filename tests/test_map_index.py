@@ -0,0 +1,71 @@
+from pathlib import Path
+from map_index import MapIndex, add_missing
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DATA = {
+    "hubMap": {"mapNodes": [
+        {"id": "forest"},
+        {"id": "desert", "type": "map", "availIfCompletedId": "forest_boss"},
+        {"id": "shop", "type": "shop", "availIfCompletedId": ["forest_boss", "desert_boss"], "availIfAdvanced": "7"},
+    ]},
+    "mapPacks": [
+        {"id": "desert_1", "map": "desert", "advance": 1},
+        {"id": "lost_0", "map": "nowhere"},
+        {"id": "forest_2", "map": "forest", "advance": 2},
+        {"id": "desert_0", "map": "desert"},
+        {"id": "forest_1", "map": "forest", "advance": 1},
+    ],
+    "mapNodes": [
+        {"id": 1, "map": "forest", "pack": "forest_1"},
+        {"id": 2, "map": "forest", "pack": "forest_1", "connect": 1,
+         "bossBattle": {"completionID": "forest_boss", "unlocksPack": "forest_2"}},
+    ],
+    "specialQuest": {"events": [
+        {"completionID": "b", "nextEvent": "c"},
+        {"completionID": "a", "nextEvent": "b"},
+        {"completionID": "c"},
+        {"completionID": "x", "nextEvent": "y"},
+        {"completionID": "y", "nextEvent": "x"},
+        {"completionID": "d", "nextEvent": "gone"},
+    ]},
+}
+
+
+def test_maps_accept_one_or_many_completion_ids():
+    index = MapIndex.build(DATA)
+    assert index.maps == [
+        ("forest", "map", [], None),
+        ("desert", "map", ["forest_boss"], None),
+        ("shop", "shop", ["forest_boss", "desert_boss"], 7),
+    ]
+    assert index.map_ids() == ["forest", "desert", "shop"]
+
+
+def test_packs_follow_the_hub_order_then_advance():
+    index = MapIndex.build(DATA)
+    # Packs of maps that aren't on the hub go last
+    assert index.pack_ids() == ["forest_1", "forest_2", "desert_0", "desert_1", "lost_0"]
+
+
+def test_nodes():
+    index = MapIndex.build(DATA)
+    assert index.nodes == [(1, "forest", "forest_1", None, None, None),
+                           (2, "forest", "forest_1", 1, "forest_boss", "forest_2")]
+
+
+def test_events_follow_next_event_chains_and_survive_loops():
+    index = MapIndex.build(DATA)
+    assert index.events == [("a", "b"), ("b", "c"), ("c", None), ("d", "gone"), ("x", "y"), ("y", "x")]
+    assert index.event_ids() == ["a", "b", "c", "d", "x", "y"]
+
+
+def test_cache_round_trip(tmp_path):
+    built = MapIndex.load_or_build(ROOT / "gameplay.dat", tmp_path)
+    assert MapIndex.load_or_build(ROOT / "gameplay.dat", tmp_path).fields() == built.fields()
+    assert len(set(built.event_ids())) == len(built.events)  # Every event once
+
+
+def test_add_missing():
+    assert add_missing(["b", "a"], ["a", "c", "d", "c"]) == (["b", "a", "c", "d"], 2)
+    assert add_missing(["a"], []) == (["a"], 0)
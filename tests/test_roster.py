@@ -0,0 +1,69 @@
+from roster import Roster
+
+SAMPLE = ("tailton,15,40,-1,-1,20,-1,7;duckron,2,30,-1,-1,10,-1,8,extra;"
+          "fluffy,75,100,-1,-1,0,-1,9;mystery,3,10,-1,-1,5,-1,10;")
+
+
+def test_raise_levels_whole_roster():
+    roster = Roster.parse(SAMPLE)
+    capped = roster.raise_levels({"tailton": 30, "duckron": 30, "fluffy": 30})
+    assert capped == [0, 1, 2]
+    assert list(roster.levels) == [30, 30, 75, 3]  # Never lowered, unknown species untouched
+    assert list(roster.columns["value1"]) == [0, 0, 0, 5]  # Raised ones start the new level with no XP
+    assert roster.tails[1] == ",extra"
+
+
+def test_raise_levels_selected_indices():
+    roster = Roster.parse(SAMPLE)
+    capped = roster.raise_levels({"tailton": 30, "duckron": 30, "mystery": 2}, [1, 3])
+    assert capped == [1, 3]
+    assert list(roster.levels) == [15, 30, 75, 3]
+    assert list(roster.columns["value1"]) == [20, 0, 0, 5]
+
+
+def test_select():
+    roster = Roster.parse(SAMPLE)
+    assert roster.select() == [0, 1, 2, 3]
+    assert roster.select(names=["duckron", "fluffy"]) == [1, 2]
+    assert roster.select(min_level=3, max_level=15) == [0, 3]
+    assert roster.select(names=["tailton", "mystery"], predicate=lambda dynamon: dynamon["value2"] > 7) == [3]
+
+
+def test_set_column():
+    roster = Roster.parse(SAMPLE)
+    roster.set_column("health", "99", [1, 3])
+    assert list(roster.healths) == [40, 99, 100, 99]
+    roster.set_column("level", 5)
+    assert list(roster.levels) == [5, 5, 5, 5]
+    roster.set_column("name", "dyno", [0])
+    assert roster.names == ["dyno", "duckron", "fluffy", "mystery"]
+
+
+def test_take_filter_and_sort_keep_records_whole():
+    roster = Roster.parse(SAMPLE)
+    taken = roster.take([2, 1])
+    assert taken.names == ["fluffy", "duckron"] and taken.tails == ["", ",extra"]
+    assert taken.serialize() == "fluffy,75,100,-1,-1,0,-1,9;duckron,2,30,-1,-1,10,-1,8,extra;"
+    assert roster.take([3]).names == ["mystery"]
+    assert len(roster.take([])) == 0
+    assert roster.filter(min_level=10).names == ["tailton", "fluffy"]
+    roster.sort("level", reverse=True)
+    assert roster.names == ["fluffy", "tailton", "mystery", "duckron"]
+    assert roster[3]["value2"] == 8 and roster.tails[3] == ",extra"
+
+
+def test_unparsed_records_are_kept_verbatim():
+    text = "tailton,15,40,-1,-1,20,-1,7;oddity,x,1,-1,-1,0,-1,8;short,3;duckron,02,30,-1,-1,10,-1,9;"
+    roster = Roster.parse(text)
+    assert roster.names == ["tailton"]
+    records = [record for _, record in roster.unparsed]
+    assert records == ["oddity,x,1,-1,-1,0,-1,8", "short,3", "duckron,02,30,-1,-1,10,-1,9"]
+    assert roster.serialize() == text
+    roster.set_column("level", 20)
+    assert roster.serialize() == text.replace("tailton,15", "tailton,20")
+
+
+def test_only_unparsed_records():
+    roster = Roster.parse("oddity,x,1,-1,-1,0,-1,8")
+    assert len(roster) == 0
+    assert roster.serialize() == "oddity,x,1,-1,-1,0,-1,8"
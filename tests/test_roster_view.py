@@ -0,0 +1,56 @@
+from roster import Roster
+from roster_view import RosterRow
+
+
+class Var:
+    def __init__(self, text):
+        self.text = text
+
+    def get(self):
+        return self.text
+
+
+def validate(name, level, health):
+    """ Stand-in for GameData.validate with two known species, levels 1-75 and 100 HP """
+    problems = {}
+    if name not in ("tailton", "fluffy"):
+        problems["name"] = f"Unknown species '{name}'"
+    if level.isdigit() and not 1 <= int(level) <= 75:
+        problems["level"] = "Level must be 1-75"
+    if health.isdigit() and not 0 <= int(health) <= 100:
+        problems["health"] = "Health must be 0-100"
+    return problems
+
+
+def row_for(roster, index, **edits):
+    """ A RosterRow bound to roster[index] without any widgets, with edits typed in """
+    row = RosterRow.__new__(RosterRow)
+    row.validate = validate
+    row.index = index
+    row.vars = {field: Var(str(roster.columns[field][index])) for field in ("name", "level", "health")}
+    for field, text in edits.items():
+        row.vars[field].text = text
+    return row
+
+
+def test_untouched_out_of_range_values_do_not_block():
+    roster = Roster.parse("mystery,80,500,-1,-1,0,-1,1;")
+    row = row_for(roster, 0)
+    assert set(row.problems()) == {"name", "level", "health"}  # Still shown as a warning
+    assert row.store(roster) == ([], {})
+
+
+def test_valid_edit_is_stored_next_to_untouched_bad_values():
+    roster = Roster.parse("mystery,80,500,-1,-1,0,-1,1;")
+    changes, rejected = row_for(roster, 0, health="50").store(roster)
+    assert changes == [("health", 0, 500, 50)]
+    assert rejected == {}
+    assert roster.healths[0] == 50
+
+
+def test_edited_invalid_values_are_rejected():
+    roster = Roster.parse("tailton,15,40,-1,-1,20,-1,1;")
+    changes, rejected = row_for(roster, 0, level="90", health="lots").store(roster)
+    assert changes == []
+    assert rejected == {"level": ("90", "Level must be 1-75"), "health": ("lots", "Health must be a whole number")}
+    assert roster[0]["level"] == 15 and roster[0]["health"] == 40
@@ -0,0 +1,66 @@
+from pathlib import Path
+import pytest
+from roster import Roster
+from save_codecs import CODECS, ItemsCodec, ListCodec, SaveFields, codec_for
+from save_document import SaveDocument
+
+ROOT = Path(__file__).resolve().parent.parent
+SAVES = [ROOT / "temp_save.xml"] + sorted((ROOT / "save_backups").glob("*.bak"))
+
+
+@pytest.mark.parametrize("path", SAVES, ids=lambda path: path.name)
+def test_every_entry_round_trips(path):
+    document = SaveDocument.load(path)
+    assert any(key[len("dynamons_world"):] in CODECS for key in document.keys())
+    for key in document.keys():
+        text = document.get(key)
+        codec = codec_for(key)
+        assert codec.encode(codec.decode(text)) == text, key
+
+
+@pytest.mark.parametrize("path", SAVES, ids=lambda path: path.name)
+def test_rewriting_every_decoded_value_changes_nothing(path, tmp_path):
+    data = path.read_bytes()
+    document = SaveDocument.from_bytes(data)
+    fields = SaveFields(document)
+    for key in document.keys():
+        fields[key] = fields[key]
+    fields.flush()
+    assert not document.dirty
+    document.write(tmp_path / "out.xml")
+    assert (tmp_path / "out.xml").read_bytes() == data
+
+
+@pytest.mark.parametrize("text", [",", ",com.iap.one", ",a,b", "a,,b", "a,", ""])
+def test_list_with_leading_or_empty_items(text):
+    codec = ListCodec(",")
+    assert codec.encode(codec.decode(text)) == text
+    assert codec_for("dynamons_worldBOUGHT_IAPS").encode(codec_for("dynamons_worldBOUGHT_IAPS").decode(text)) == text
+
+
+def test_leading_separator_is_an_empty_first_item():
+    assert ListCodec(",").decode(",com.iap.one") == ["", "com.iap.one"]
+    assert ListCodec(",").decode("") == []
+
+
+@pytest.mark.parametrize("text, trailing", [("heal_spray,5;discatch,1", False), ("heal_spray,5;discatch,1;", True),
+                                            ("", False), ("odd,007;", True)])
+def test_items_with_and_without_trailing_separator(text, trailing):
+    items = ItemsCodec().decode(text)
+    assert items.trailing_separator == trailing
+    assert ItemsCodec().encode(items) == text
+
+
+def test_items_edit_keeps_trailing_separator():
+    items = ItemsCodec().decode("heal_spray,5;")
+    items["heal_spray"] = 9999
+    items["new_item"] = 1
+    assert ItemsCodec().encode(items) == "heal_spray,9999;new_item,1;"
+    assert ItemsCodec().decode("odd,007")["odd"] == "007"  # Would print back differently as an int
+
+
+def test_empty_roster():
+    roster = Roster.parse("")
+    assert len(roster) == 0
+    assert roster.serialize() == ""
+    assert codec_for("dynamons_worldMONS_DATA").encode(codec_for("dynamons_worldMONS_DATA").decode("")) == ""
@@ -0,0 +1,83 @@
+from xml.sax.saxutils import escape
+from save_diff import Change, diff_documents, format_changes
+from save_document import SaveDocument
+
+
+def document(**values):
+    entries = "".join(f'    <string name="dynamons_world{name}">{escape(text)}</string>\n' for name, text in values.items())
+    return SaveDocument.from_bytes(f"<?xml version='1.0' encoding='utf-8' standalone='yes' ?>\n<map>\n{entries}</map>\n"
+                                   .encode())
+
+
+def test_identical_documents():
+    assert diff_documents(document(PLAYER_COINS="5"), document(PLAYER_COINS="5")) == []
+
+
+def test_added_removed_and_changed_entries():
+    old = document(PLAYER_COINS="5", FIRST_RUN="true")
+    new = document(PLAYER_COINS="6", IS_BUYER="true")
+    assert diff_documents(old, new) == [
+        Change("changed", ("dynamons_worldPLAYER_COINS",), "5", "6"),
+        Change("removed", ("dynamons_worldFIRST_RUN",), "true", None),
+        Change("added", ("dynamons_worldIS_BUYER",), None, "true"),
+    ]
+
+
+def test_dynamons_are_matched_by_id():
+    old = document(MONS_DATA="tailton,15,40,-1,-1,20,-1,7;duckron,2,30,-1,-1,10,-1,8;fluffy,9,50,-1,-1,0,-1,9;")
+    # Reordered, one levelled up, one released and one caught
+    new = document(MONS_DATA="fluffy,9,50,-1,-1,0,-1,9;tailton,16,40,-1,-1,0,-1,7;anubolt,1,10,-1,-1,0,-1,10;")
+    changes = diff_documents(old, new)
+    key = "dynamons_worldMONS_DATA"
+    assert [(change.kind, change.path) for change in changes] == [
+        ("changed", (key, 7, "level")),
+        ("changed", (key, 7, "value1")),
+        ("removed", (key, 8)),
+        ("added", (key, 10)),
+    ]
+    assert changes[0].old == 15 and changes[0].new == 16
+    assert changes[2].old["name"] == "duckron" and changes[3].new["name"] == "anubolt"
+
+
+def test_dynamons_fall_back_to_positions_when_ids_repeat():
+    old = document(MONS_DATA="tailton,15,40,-1,-1,20,-1,0;duckron,2,30,-1,-1,10,-1,0;")
+    new = document(MONS_DATA="tailton,15,40,-1,-1,20,-1,0;duckron,3,30,-1,-1,10,-1,0;fluffy,9,50,-1,-1,0,-1,0;")
+    changes = diff_documents(old, new)
+    assert [(change.kind, change.path) for change in changes] == [
+        ("changed", ("dynamons_worldMONS_DATA", 1, "level")),
+        ("added", ("dynamons_worldMONS_DATA", 2)),
+    ]
+
+
+def test_json_values_are_compared_per_path():
+    old = document(PVP_SEASONS='{"season":3,"ranks":[1,2,3],"best":{"rank":2}}')
+    new = document(PVP_SEASONS='{"season":4,"ranks":[1,5],"best":{"rank":2,"date":"x"}}')
+    key = "dynamons_worldPVP_SEASONS"
+    assert diff_documents(old, new) == [
+        Change("changed", (key, "season"), 3, 4),
+        Change("changed", (key, "ranks", 1), 2, 5),
+        Change("removed", (key, "ranks", 2), 3, None),
+        Change("added", (key, "best", "date"), None, "x"),
+    ]
+
+
+def test_id_lists_are_compared_as_sets():
+    old = document(MAPS_UNLOCKED="forest,desert,cave")
+    new = document(MAPS_UNLOCKED="desert,forest,sea")
+    key = ("dynamons_worldMAPS_UNLOCKED",)
+    assert diff_documents(old, new) == [Change("removed", key, "cave", None), Change("added", key, None, "sea")]
+    # Only reordered: no IDs added or removed, just the text
+    reordered = diff_documents(old, document(MAPS_UNLOCKED="cave,forest,desert"))
+    assert reordered == [Change("changed", key, "forest,desert,cave", "cave,forest,desert")]
+
+
+def test_only_the_spelling_differs():
+    old = document(USING_MONS='{"7":1}')
+    new = document(USING_MONS='{"7": 1}')
+    assert diff_documents(old, new) == [Change("changed", ("dynamons_worldUSING_MONS",), '{"7":1}', '{"7": 1}')]
+
+
+def test_format_changes():
+    text = format_changes([Change("changed", ("dynamons_worldPVP_SEASONS", "season"), 3, 4),
+                           Change("added", ("dynamons_worldIS_BUYER",), None, "true")])
+    assert text == "~ dynamons_worldPVP_SEASONS['season']: 3 -> 4\n+ dynamons_worldIS_BUYER: true"
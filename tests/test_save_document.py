@@ -0,0 +1,109 @@
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from save_document import SaveDocument
+
+ROOT = Path(__file__).resolve().parent.parent
+PREFS = b"""<?xml version='1.0' encoding='utf-8' standalone='yes' ?>
+<map>
+    <string name="text">plain</string>
+    <string name="empty" />
+    <int name="count" value="5" />
+    <long name="single" value='7' />
+</map>
+"""
+
+
+def written(document, tmp_path):
+    path = tmp_path / "MainActivity.xml"
+    document.write(path)
+    return path.read_bytes()
+
+
+def test_unmodified_document_writes_back_byte_identical(tmp_path):
+    data = (ROOT / "temp_save.xml").read_bytes()
+    assert written(SaveDocument.from_bytes(data), tmp_path) == data
+    assert written(SaveDocument.from_bytes(PREFS), tmp_path) == PREFS
+
+
+def test_only_the_edited_value_changes(tmp_path):
+    document = SaveDocument.from_bytes(PREFS)
+    document.set("text", "edited")
+    assert written(document, tmp_path) == PREFS.replace(b">plain<", b">edited<")
+    assert not document.dirty
+
+
+def test_special_characters_are_escaped(tmp_path):
+    value = 'a & b < c > d "quoted"'
+    document = SaveDocument.from_bytes(PREFS)
+    document.set("text", value)
+    document.set("count", '"&<>')
+    data = written(document, tmp_path)
+    assert b"a &amp; b &lt; c &gt; d" in data
+    assert b'value="&quot;&amp;&lt;&gt;"' in data
+    reloaded = SaveDocument.from_bytes(data)
+    assert reloaded.get("text") == value
+    assert reloaded.get("count") == '"&<>'
+
+
+def test_self_closing_string_gets_a_body(tmp_path):
+    document = SaveDocument.from_bytes(PREFS)
+    document.set("empty", "now set")
+    data = written(document, tmp_path)
+    assert SaveDocument.from_bytes(data).get("empty") == "now set"
+    assert data.replace(b' >now set</string>', b' />') == PREFS
+
+
+def test_int_value_attribute(tmp_path):
+    document = SaveDocument.from_bytes(PREFS)
+    document.set("count", "9999")
+    data = written(document, tmp_path)
+    assert data == PREFS.replace(b'value="5"', b'value="9999"')
+
+
+def test_two_snapshots_before_the_first_is_saved(tmp_path):
+    path = tmp_path / "MainActivity.xml"
+    document = SaveDocument.from_bytes(PREFS)
+    document.set("text", "first")
+    first = document.snapshot()
+    document.set("count", "6")
+    second = document.snapshot()
+
+    first.write(path)
+    document.saved(first)
+    assert document.dirty == {"count"}  # Edited after the first snapshot
+
+    second.write(path)
+    document.saved(second)
+    assert not document.dirty
+    reloaded = SaveDocument.load(path)
+    assert (reloaded.get("text"), reloaded.get("count")) == ("first", "6")
+    assert written(document, tmp_path) == path.read_bytes()
+
+
+def test_snapshot_ignores_later_edits(tmp_path):
+    document = SaveDocument.from_bytes(PREFS)
+    document.set("text", "snapshotted")
+    snapshot = document.snapshot()
+    document.set("text", "later")
+    assert b">snapshotted<" in snapshot.render()
+    document.saved(snapshot.write(tmp_path / "MainActivity.xml"))
+    assert document.dirty == {"text"}
+
+
+def test_full_rewrite_when_a_value_cant_be_spliced(tmp_path):
+    # value='7' isn't matched by the splicing scanner
+    document = SaveDocument.from_bytes(PREFS)
+    assert "single" not in document.spans
+    document.set("single", "8")
+    reloaded = SaveDocument.from_bytes(written(document, tmp_path))
+    assert reloaded.get("single") == "8"
+    assert reloaded.get("text") == "plain"
+    assert "single" in reloaded.spans
+
+
+def test_full_rewrite_without_raw_bytes(tmp_path):
+    document = SaveDocument(ET.ElementTree(ET.fromstring(PREFS)))
+    document.set("count", "1")
+    reloaded = SaveDocument.from_bytes(written(document, tmp_path))
+    assert reloaded.get("count") == "1"
+    assert reloaded.get("empty") == ""
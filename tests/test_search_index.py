@@ -0,0 +1,36 @@
+import base64
+import json
+import lazy_json
+from search_index import SearchIndex
+
+DOCUMENT = {
+    "mons": [{"id": "anubolt", "title": "Anubolt", "skills": ["poison_bite", "dark_blast"]},
+             {"id": "dreq", "title": "Dreq", "skills": []}],
+    "maps": {"hub": {"nodes": [{"id": "volcano_1"}, {"id": "ice_2"}]}, "empty": {}},
+}
+
+
+def write_base64(tmp_path, value):
+    path = tmp_path / "gameplay.dat"
+    path.write_bytes(base64.b64encode(json.dumps(value).encode('utf-8')))
+    return path
+
+
+def same_index(a, b):
+    return all(getattr(a, field) == getattr(b, field) for field in ("parents", "keys", "vocabulary", "postings", "offsets"))
+
+
+def test_lazy_build_matches_eager_build(tmp_path):
+    data = lazy_json.load_file(write_base64(tmp_path, DOCUMENT))
+    index = SearchIndex.build(data)
+    assert same_index(index, SearchIndex.build(DOCUMENT))
+    assert not data._values  # The walk didn't leave the tree decoded
+    assert index.search("poison") == [("mons", 0, "skills", 0)]
+    assert index.search("volcano") == [("maps", "hub", "nodes", 0, "id")]
+
+
+def test_load_or_build_caches(tmp_path):
+    path = write_base64(tmp_path, DOCUMENT)
+    built = SearchIndex.load_or_build(path, tmp_path / "cache")
+    assert list((tmp_path / "cache").iterdir())
+    assert same_index(SearchIndex.load_or_build(path, tmp_path / "cache"), built)